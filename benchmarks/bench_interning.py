@@ -0,0 +1,77 @@
+"""Resident memory of loading the same descriptors for many tenants.
+
+usage:
+    $ python benchmarks/bench_interning.py --tenants 500 --tables 200
+
+Each mode runs in a fresh interpreter, and reports its peak resident set size.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+
+
+def make_descriptor(i: int) -> dict:
+    return {
+        'name': 'table_%d' % i,
+        'fields': [
+            {'name': 'id', 'type': 'bigint', 'constraints': {'required': True}},
+            {'name': 'name', 'type': 'str', 'constraints': {'required': True, 'maxLength': 200}},
+            {'name': 'email', 'type': 'str', 'constraints': {'unique': True}},
+            {'name': 'score', 'type': 'float', 'constraints': {'minimum': 0, 'maximum': 100}},
+            {'name': 'count', 'type': 'int', 'constraints': {'minimum': 0}},
+            {'name': 'birthday', 'type': 'date'},
+            {'name': 'created_at', 'type': 'datetime'},
+            {'name': 'updated_at', 'type': 'datetime'},
+            {'name': 'payload', 'type': 'json'},
+            {'name': 'active', 'type': 'bool'},
+        ],
+        'primaryKey': ['id'],
+    }
+
+
+def run(tenants: int, tables: int, intern: bool) -> None:
+    from sqlalchemy import MetaData
+    from marshmallow_sa_core import JSONTableSchema
+
+    # serialized form, so every tenant decodes its own copy of the strings
+    raw = [json.dumps(make_descriptor(i)) for i in range(tables)]
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    schema = JSONTableSchema()
+    keep = []
+    for tenant in range(tenants):
+        metadata = MetaData(schema='tenant_%d' % tenant)
+        for descriptor in raw:
+            schema.load(json.loads(descriptor), metadata=metadata, intern=intern)
+        keep.append(metadata)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({'intern': intern, 'tenants': tenants, 'tables': tables,
+                      'rss_kib': peak - baseline}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tenants', type=int, default=500)
+    parser.add_argument('--tables', type=int, default=200)
+    parser.add_argument('--intern', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run(args.tenants, args.tables, args.intern)
+        return
+
+    for intern in (False, True):
+        cmd = [sys.executable, __file__, '--child',
+               '--tenants', str(args.tenants), '--tables', str(args.tables)]
+        if intern:
+            cmd.append('--intern')
+        subprocess.run(cmd, check=True)
+
+
+if __name__ == '__main__':
+    main()
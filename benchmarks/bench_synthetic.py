@@ -0,0 +1,80 @@
+"""Throughput of synthetic data generation, and of bulk inserting it.
+
+usage:
+    $ python benchmarks/bench_synthetic.py --rows 1000000 --url sqlite://
+
+requires numpy: `pip install marshmallow-sa-core[numpy]`
+"""
+
+import argparse
+import json
+import time
+
+
+DESCRIPTOR = {
+    'name': 'events',
+    'fields': [
+        {'name': 'id', 'type': 'bigint', 'constraints': {'required': True}},
+        {'name': 'name', 'type': 'str', 'constraints': {'required': True, 'maxLength': 200}},
+        {'name': 'email', 'type': 'str', 'constraints': {'unique': True}},
+        {'name': 'score', 'type': 'float', 'constraints': {'minimum': 0, 'maximum': 100}},
+        {'name': 'count', 'type': 'int', 'constraints': {'minimum': 0}},
+        {'name': 'birthday', 'type': 'date'},
+        {'name': 'created_at', 'type': 'datetime'},
+        {'name': 'active', 'type': 'bool'},
+    ],
+    'primaryKey': ['id'],
+}
+
+
+def rate(rows: int, seconds: float) -> int:
+    return int(rows / seconds) if seconds else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--batch-size', type=int, default=100000)
+    parser.add_argument('--insert-rows', type=int, default=100000)
+    parser.add_argument('--url', default='sqlite://')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    import sqlalchemy as sa
+    from marshmallow_sa_core import JSONTableSchema
+    from marshmallow_sa_core.synthetic import SyntheticData
+
+    data = SyntheticData(DESCRIPTOR, seed=args.seed)
+    start = time.perf_counter()
+    for _ in data.iter_batches(args.rows, args.batch_size):
+        pass
+    columns = time.perf_counter() - start
+
+    data = SyntheticData(DESCRIPTOR, seed=args.seed)
+    start = time.perf_counter()
+    for _ in data.iter_rows(args.insert_rows, args.batch_size):
+        pass
+    rows = time.perf_counter() - start
+
+    engine = sa.create_engine(args.url)
+    table = JSONTableSchema().load(DESCRIPTOR)
+    data = SyntheticData(DESCRIPTOR, seed=args.seed)
+    with engine.begin() as connection:
+        table.drop(connection, checkfirst=True)
+        table.create(connection)
+        start = time.perf_counter()
+        for batch in data.iter_rows(args.insert_rows, args.batch_size):
+            connection.execute(table.insert(), batch)
+        insert = time.perf_counter() - start
+        table.drop(connection)
+
+    print(json.dumps({
+        'columns_rows_per_s': rate(args.rows, columns),
+        'dict_rows_per_s': rate(args.insert_rows, rows),
+        'insert_rows_per_s': rate(args.insert_rows, insert),
+        'url': args.url,
+    }))
+
+
+if __name__ == '__main__':
+    main()
@@ -11,6 +11,7 @@ from flask.views import MethodView
 from flask_smorest import Api, Blueprint, abort
 from flask_sqlalchemy import SQLAlchemy
 from marshmallow_sa_core import JSONTableSchema
+from marshmallow_sa_core.json_schema import table_descriptor_json_schema
 
 app = Flask(__name__)
 # docs
@@ -47,6 +48,13 @@ class Guide(MethodView):
         return {'TODO': 'example guide'}
 
 
+@blp.route("/schemas/table-descriptor.json")
+class TableDescriptorJSONSchema(MethodView):
+    def get(self):
+        """JSON Schema of table descriptors, for client side validation"""
+        return table_descriptor_json_schema()
+
+
 @blp.route("/tables/")
 class TableList(MethodView):
     @blp.arguments(JSONTableSchema)
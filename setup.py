@@ -31,6 +31,7 @@ docs_requires = [
 extras = {
     "test": test_requires,
     "docs": docs_requires,
+    "numpy": ["numpy >= 1.20"],
 }
 
 extras["all"] = sum(extras.values(), [])
@@ -47,6 +48,9 @@ setup(
     long_description=open("README.md").read(),
     long_description_content_type="text/markdown",
     include_package_data=True,
+    entry_points={
+        'console_scripts': ['marshmallow-sa-core = marshmallow_sa_core.cli:main'],
+    },
     zip_safe=False,
     python_requires='>=3.8',
     url='https://github.com/featureoverload/marshmallow-sa-core',
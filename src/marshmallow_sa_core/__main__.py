@@ -0,0 +1,5 @@
+import sys
+
+from marshmallow_sa_core.cli import main
+
+sys.exit(main())
@@ -0,0 +1,171 @@
+"""Descriptor Cache
+
+- persistent on-disk cache of loaded table descriptors, for a fast startup of services
+  loading many descriptors.
+
+An entry is keyed by the hash of the descriptor, the library `__version__`, the schema
+class, the type mapping and the load options, so it is invalidated when any of them changes. It holds
+the pickled table, which is rehydrated into the `MetaData` given to `load()`.
+
+The cache directory must be trusted: entries are unpickled.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from typing import Any
+from typing import Mapping
+from typing import Optional
+
+from sqlalchemy import CheckConstraint
+from sqlalchemy import MetaData
+from sqlalchemy import Table
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.sql.elements import TextClause
+
+import marshmallow_sa_core
+from marshmallow_sa_core.table_schema import JSONTableSchema
+from marshmallow_sa_core.utilities.const import COLUMNTYPE_TO_SA_TYPE_MAPPING
+from marshmallow_sa_core.utilities.intern import intern_name
+from marshmallow_sa_core.utilities.intern import intern_string
+from marshmallow_sa_core.utilities.intern import shared_type
+
+VERSION = marshmallow_sa_core.__version__
+
+_SUFFIX = '.pickle'
+
+
+def _type_fingerprint(sa_type: Any) -> str:
+    """`module.Class` of a type class, and `module.Class:Class(arguments)` of a type instance."""
+    if isinstance(sa_type, type):
+        return '%s.%s' % (sa_type.__module__, sa_type.__qualname__)
+    return '%s:%r' % (_type_fingerprint(type(sa_type)), sa_type)
+
+
+def _type_mapping_fingerprint(type_mapping: Mapping) -> list:
+    return sorted((str(key), _type_fingerprint(sa_type)) for key, sa_type in type_mapping.items())
+
+
+def _intern_table(table: Table, type_mapping: Mapping) -> None:
+    """Shares the names, SQL text and types of an unpickled table, as the `intern` load option does."""
+    shared_classes = {sa_type for sa_type in type_mapping.values() if isinstance(sa_type, type)}
+    table.name = intern_name(table.name)
+    for column in table.columns:
+        column.name = intern_name(column.name)
+        cls = type(column.type)
+        if cls in shared_classes:
+            shared = shared_type(cls)
+            # instances of the mapped class without arguments only
+            if shared is not cls and repr(shared) == repr(column.type):
+                column.type = shared
+        for constraint in column.constraints:
+            if isinstance(constraint, CheckConstraint) and isinstance(constraint.sqltext, TextClause):
+                constraint.sqltext.text = intern_string(constraint.sqltext.text)
+
+
+def _move_table(table: Table, metadata: MetaData) -> None:
+    # private API of SQLAlchemy, the table is added first so that a failure changes nothing
+    metadata._add_table(table.name, table.schema, table)
+    table.metadata.remove(table)
+    table.metadata = metadata
+
+
+def _adopt_table(table: Table, metadata: MetaData) -> Table:
+    """Moves an unpickled table into `metadata`, copying it when that can not be done."""
+    # `to_metadata()` copies every column, constraint and index: a cache hit would be
+    # about 5 times slower, hardly faster than loading the descriptor again
+    if table.key in metadata.tables:
+        raise InvalidRequestError("Table '%s' is already defined for this MetaData instance." % table.key)
+    try:
+        _move_table(table, metadata)
+    except (AttributeError, TypeError):
+        return table.to_metadata(metadata)
+    return table
+
+
+class DescriptorCache:
+    """
+    On-disk cache of loaded table descriptors.
+
+    >>> cache = DescriptorCache('/var/cache/tables')
+    >>> table = cache.load(descriptor, metadata=metadata)
+    """
+
+    def __init__(self, directory: str, schema: Optional[JSONTableSchema] = None) -> None:
+        self.directory = directory
+        self.schema = schema or JSONTableSchema()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, descriptor: dict, metadata: Optional[MetaData] = None, **options: Any) -> str:
+        """Returns the cache key of a descriptor loaded with the options."""
+        type_mapping = options.pop('type_mapping', COLUMNTYPE_TO_SA_TYPE_MAPPING)
+        options.pop('intern', None)  # interned on reading, see `load()`
+        identity = {
+            'version': VERSION,
+            'schema': '%s.%s' % (type(self.schema).__module__, type(self.schema).__qualname__),
+            'descriptor': descriptor,
+            'type_mapping': _type_mapping_fingerprint(type_mapping),
+            'options': options,
+        }
+        if metadata is not None:
+            identity['metadata'] = {
+                'schema': metadata.schema,
+                'naming_convention': sorted((str(k), str(v)) for k, v in metadata.naming_convention.items()),
+            }
+        serialized = json.dumps(identity, sort_keys=True, separators=(',', ':'),
+                                ensure_ascii=False, default=str)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def load(self, descriptor: dict, metadata: Optional[MetaData] = None, **options: Any) -> Table:
+        """
+        Loads a descriptor (see `JSONTableSchema.load` for the options), from the cache if possible.
+
+        A cache entry which can not be read is replaced. With the `intern` option, the names,
+        SQL text and types of a cached table are interned when it is read.
+        """
+        key = self.key(descriptor, metadata, **options)
+        table = self._read(key)
+        if table is not None and options.get('intern'):
+            _intern_table(table, options.get('type_mapping', COLUMNTYPE_TO_SA_TYPE_MAPPING))
+        if table is None:
+            cached_metadata = MetaData()
+            if metadata is not None:
+                cached_metadata = MetaData(schema=metadata.schema,
+                                           naming_convention=dict(metadata.naming_convention))
+            table = self.schema.load(descriptor, metadata=cached_metadata, **options)
+            self._write(key, table)
+        if metadata is not None:
+            table = _adopt_table(table, metadata)
+        return table
+
+    def clear(self) -> None:
+        """Removes all cache entries."""
+        for name in os.listdir(self.directory):
+            if name.endswith(_SUFFIX):
+                os.remove(os.path.join(self.directory, name))
+
+    def _read(self, key: str) -> Optional[Table]:
+        try:
+            with open(self.path(key), 'rb') as fp:
+                version, table = pickle.load(fp)
+        except Exception:
+            # missing, corrupted, or written with an incompatible version of a dependency
+            return None
+        if version != VERSION or not isinstance(table, Table):
+            return None
+        return table
+
+    def _write(self, key: str, table: Table) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                pickle.dump((VERSION, table), fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,203 @@
+"""Command Line
+
+usage:
+    $ marshmallow-sa-core validate descriptors/ [more/paths.json ...]
+
+- validate: loads table descriptor files with `JSONTableSchema`, in parallel, and prints one
+  JSON line `{"path": ..., "errors": {...}}` per invalid file. Exits with 1 if a file is invalid.
+
+Valid files are recorded in a local cache (`--cache`) and skipped by the next runs while their
+(mtime, size) is unchanged, or while their content hash is the hash of a valid file. The cache
+is invalidated by a new version.
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from marshmallow import ValidationError
+
+import marshmallow_sa_core
+from marshmallow_sa_core.table_schema import JSONTableSchema
+
+VERSION = marshmallow_sa_core.__version__
+
+DEFAULT_CACHE = '.marshmallow-sa-core-cache.json'
+DEFAULT_PATTERN = '*.json'
+
+#: below this count of files to validate, they are validated without starting worker processes.
+MIN_PARALLEL_FILES = 32
+
+_table_schema = JSONTableSchema()
+
+#: (path, content hash, errors or None)
+Result = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+def iter_files(paths: Sequence[str], pattern: str = DEFAULT_PATTERN) -> Iterator[str]:
+    """Yields the given files, and the files matching `pattern` under the given directories (hidden ones excluded)."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            for name in sorted(files):
+                if not name.startswith('.') and fnmatch.fnmatch(name, pattern):
+                    yield os.path.join(root, name)
+
+
+def validate_file(path: str) -> Result:
+    """Loads a descriptor file, returns its content hash and its errors (None if it is valid)."""
+    try:
+        with open(path, 'rb') as fp:
+            content = fp.read()
+    except OSError as exc:
+        return path, '', {'_schema': [str(exc)]}
+    digest = hashlib.sha256(content).hexdigest()
+    try:
+        descriptor = json.loads(content)
+    except ValueError as exc:
+        return path, digest, {'_schema': ['Invalid JSON: %s' % exc]}
+    try:
+        _table_schema.load(descriptor)
+    except ValidationError as exc:
+        errors = exc.messages if isinstance(exc.messages, dict) else {'_schema': exc.messages}
+        return path, digest, errors
+    except Exception as exc:
+        return path, digest, {'_schema': ['%s: %s' % (type(exc).__name__, exc)]}
+    return path, digest, None
+
+
+class ValidationCache:
+    """Files found valid, as {absolute path: [mtime_ns, size, content hash]}."""
+
+    def __init__(self, path: Optional[str]) -> None:
+        self.path = path
+        self.files: Dict[str, List[Any]] = {}
+        if path is not None:
+            try:
+                with open(path, encoding='utf-8') as fp:
+                    cached = json.load(fp)
+                if cached.get('version') == VERSION:
+                    self.files = cached['files']
+            except (OSError, ValueError, KeyError, AttributeError):
+                pass
+        self.hashes = {entry[2] for entry in self.files.values()}
+
+    def is_valid(self, path: str, stat: os.stat_result) -> bool:
+        entry = self.files.get(os.path.abspath(path))
+        return entry is not None and entry[:2] == [stat.st_mtime_ns, stat.st_size]
+
+    def add(self, path: str, digest: str) -> None:
+        stat = os.stat(path)
+        self.files[os.path.abspath(path)] = [stat.st_mtime_ns, stat.st_size, digest]
+        self.hashes.add(digest)
+
+    def discard(self, path: str) -> None:
+        self.files.pop(os.path.abspath(path), None)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        files = {path: entry for path, entry in self.files.items() if os.path.exists(path)}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                json.dump({'version': VERSION, 'files': files}, fp)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def _validate_all(paths: List[str], jobs: int) -> Iterator[Result]:
+    if jobs <= 1 or len(paths) < MIN_PARALLEL_FILES:
+        yield from map(validate_file, paths)
+        return
+    chunksize = max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(validate_file, paths, chunksize=chunksize)
+
+
+def validate(paths: Sequence[str],
+             jobs: Optional[int] = None,
+             cache: Optional[str] = DEFAULT_CACHE,
+             pattern: str = DEFAULT_PATTERN,
+             out=None) -> Dict[str, int]:
+    """
+    Validates descriptor files, writes a JSON line per invalid file to `out`.
+
+    Returns:
+        - dict: count of `checked`, `skipped` and `invalid` files.
+    """
+    out = out or sys.stdout
+    validation_cache = ValidationCache(cache)
+
+    pending = []
+    skipped = 0
+    for path in iter_files(paths, pattern):
+        try:
+            if validation_cache.is_valid(path, os.stat(path)):
+                skipped += 1
+                continue
+            # touched (e.g. checked out again) but maybe unchanged
+            with open(path, 'rb') as fp:
+                digest = hashlib.sha256(fp.read()).hexdigest()
+        except OSError:
+            pending.append(path)
+            continue
+        if digest in validation_cache.hashes:
+            validation_cache.add(path, digest)
+            skipped += 1
+        else:
+            pending.append(path)
+
+    invalid = 0
+    for path, digest, errors in _validate_all(pending, jobs or os.cpu_count() or 1):
+        if errors is None:
+            validation_cache.add(path, digest)
+            continue
+        validation_cache.discard(path)
+        invalid += 1
+        out.write(json.dumps({'path': path, 'errors': errors}, ensure_ascii=False, sort_keys=True) + '\n')
+    validation_cache.save()
+    return {'checked': len(pending), 'skipped': skipped, 'invalid': invalid}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='marshmallow-sa-core')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    validate_parser = commands.add_parser('validate', help='validate table descriptor files')
+    validate_parser.add_argument('paths', nargs='+', help='descriptor files or directories')
+    validate_parser.add_argument('-j', '--jobs', type=int, default=None,
+                                 help='count of worker processes, defaults to the count of CPUs')
+    validate_parser.add_argument('--pattern', default=DEFAULT_PATTERN,
+                                 help='file name pattern of descriptors in directories (default: %(default)s)')
+    validate_parser.add_argument('--cache', default=DEFAULT_CACHE,
+                                 help='cache of valid files (default: %(default)s)')
+    validate_parser.add_argument('--no-cache', dest='cache', action='store_const', const=None,
+                                 help='validate all files, without reading or writing the cache')
+    args = parser.parse_args(argv)
+
+    counts = validate(args.paths, jobs=args.jobs, cache=args.cache, pattern=args.pattern)
+    sys.stderr.write('%(checked)d checked, %(skipped)d skipped, %(invalid)d invalid\n' % counts)
+    return 1 if counts['invalid'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
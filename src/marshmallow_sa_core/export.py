@@ -0,0 +1,189 @@
+"""Data Package Export
+
+ref: https://specs.frictionlessdata.io/data-package/
+
+- export the rows of a SQLAlchemy Table together with its table descriptor.
+
+Rows are streamed from a server side cursor and written chunk by chunk, so the
+export runs in constant memory whatever the size of the table.
+"""
+
+import base64
+import csv
+import decimal
+import json
+import os
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from sqlalchemy import Table
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+
+from marshmallow_sa_core.table_schema import JSONTableSchema
+from marshmallow_sa_core.utilities.const import COLUMNTYPE_TO_SA_TYPE_MAPPING
+from marshmallow_sa_core.utilities.const import column_type_of
+from marshmallow_sa_core.utilities.enum import DBColumnType
+
+DEFAULT_CHUNK_SIZE = 10000
+
+Serializer = Optional[Callable[[Any], Any]]
+
+
+def _isoformat(value: Any) -> str:
+    return value.isoformat()
+
+
+def _json_default(value: Any) -> Any:
+    """Serializes the values of column types without a serializer, e.g. Numeric, UUID or LargeBinary."""
+    if isinstance(value, decimal.Decimal):
+        # NaN and Infinity are not valid JSON numbers
+        return float(value) if value.is_finite() else str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return base64.b64encode(value).decode('ascii')
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def _dump_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=_json_default)
+
+
+def _dump_bool(value: Any) -> str:
+    return 'true' if value else 'false'
+
+
+#: serializers of the values of each column type, None when the value is written as it is.
+CSV_SERIALIZERS: Dict[DBColumnType, Serializer] = {
+    DBColumnType.bool: _dump_bool,
+    DBColumnType.date: _isoformat,
+    DBColumnType.datetime: _isoformat,
+    DBColumnType.time: _isoformat,
+    DBColumnType.json: _dump_json,
+}
+NDJSON_SERIALIZERS: Dict[DBColumnType, Serializer] = {
+    DBColumnType.date: _isoformat,
+    DBColumnType.datetime: _isoformat,
+    DBColumnType.time: _isoformat,
+}
+
+FORMATS = {
+    'csv': ('text/csv', CSV_SERIALIZERS),
+    'ndjson': ('application/x-ndjson', NDJSON_SERIALIZERS),
+}
+
+
+def column_serializers(table: Table,
+                       serializers: Dict[DBColumnType, Serializer],
+                       type_mapping=COLUMNTYPE_TO_SA_TYPE_MAPPING) -> List[Serializer]:
+    """Chooses the serializer of each column, once per export."""
+    return [serializers.get(column_type_of(column.type, type_mapping)) for column in table.columns]
+
+
+def _serialize_chunk(rows: Sequence[Sequence[Any]], serializers: List[Serializer]) -> List[List[Any]]:
+    converters = [(i, func) for i, func in enumerate(serializers) if func is not None]
+    chunk = []
+    for row in rows:
+        row = list(row)
+        for i, func in converters:
+            value = row[i]
+            if value is not None:
+                row[i] = func(value)
+        chunk.append(row)
+    return chunk
+
+
+def export_rows(connection: Connection,
+                table: Table,
+                fp,
+                format: str = 'csv',
+                chunk_size: int = DEFAULT_CHUNK_SIZE,
+                type_mapping=COLUMNTYPE_TO_SA_TYPE_MAPPING,
+                null_value: str = '') -> int:
+    """
+    Writes the rows of the table to a text file object, returns the count of rows written.
+
+    CSV has a header row, and NULL is written as `null_value`. With the default empty
+    value, NULL and empty strings are written alike, pass e.g. `null_value='\\N'` to tell
+    them apart.
+    """
+    if format not in FORMATS:
+        raise ValueError('unsupported format %r, expected one of %s' % (format, ', '.join(FORMATS)))
+    serializers = column_serializers(table, FORMATS[format][1], type_mapping)
+    names = [column.name for column in table.columns]
+
+    result = connection.execution_options(stream_results=True, yield_per=chunk_size).execute(
+        select(table))
+
+    count = 0
+    if format == 'csv':
+        writer = csv.writer(fp, lineterminator='\n')
+        writer.writerow(names)
+    for rows in result.partitions(chunk_size):
+        if any(serializers):
+            rows = _serialize_chunk(rows, serializers)
+        if format == 'csv':
+            if null_value:
+                rows = [[null_value if value is None else value for value in row] for row in rows]
+            writer.writerows(rows)
+        else:
+            fp.write(''.join(_dump_json(dict(zip(names, row))) + '\n' for row in rows))
+        count += len(rows)
+    return count
+
+
+def export_data_package(connection: Connection,
+                        table: Table,
+                        directory: str,
+                        format: str = 'csv',
+                        chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        encoding: str = 'utf-8',
+                        type_mapping=COLUMNTYPE_TO_SA_TYPE_MAPPING,
+                        null_value: str = '') -> dict:
+    """
+    Exports a table as a data package: `datapackage.json` and the data file
+    `<table name>.<format>` written into `directory`.
+
+    Args:
+        - connection: connection to read the rows from.
+        - table: the table to export.
+        - directory: the output directory, created if missing.
+        - format: 'csv' or 'ndjson'.
+        - chunk_size: count of rows fetched and written at once.
+        - null_value: CSV value of NULL, declared as the `missingValues` of the schema.
+
+    Returns:
+        - dict: the data package descriptor.
+    """
+    if format not in FORMATS:
+        raise ValueError('unsupported format %r, expected one of %s' % (format, ', '.join(FORMATS)))
+    os.makedirs(directory, exist_ok=True)
+
+    path = '%s.%s' % (table.name, format)
+    with open(os.path.join(directory, path), 'w', newline='', encoding=encoding) as fp:
+        count = export_rows(connection, table, fp, format, chunk_size, type_mapping, null_value)
+
+    schema = JSONTableSchema().dump(table, type_mapping=type_mapping)
+    if format == 'csv':
+        schema = dict(schema, missingValues=[null_value])
+
+    descriptor = {
+        'name': table.name,
+        'resources': [{
+            'name': table.name,
+            'path': path,
+            'format': format,
+            'mediatype': FORMATS[format][0],
+            'encoding': encoding,
+            'stats': {'rows': count},
+            'schema': schema,
+        }],
+    }
+    with open(os.path.join(directory, 'datapackage.json'), 'w', encoding='utf-8') as fp:
+        json.dump(descriptor, fp, ensure_ascii=False, indent=2)
+    return descriptor
@@ -0,0 +1,348 @@
+"""Schema Inference
+
+- infer a table descriptor (loadable by `JSONTableSchema`) from rows of text values,
+  e.g. a CSV file which comes without a descriptor.
+
+The type, `required`, `minimum`/`maximum` and `minLength`/`maxLength` are computed over
+every row, in a single pass. Only `unique` needs the values themselves, the rows are kept
+in a bounded, reservoir-sampled window, so the inference runs in constant memory however
+large the input is. `unique` is only inferred when every row fits in the window, a sample
+can not tell that the values of the whole input are distinct.
+"""
+
+import collections
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import re
+from datetime import date
+from datetime import datetime
+from datetime import time
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from marshmallow_sa_core.utilities.enum import DBColumnType
+
+DEFAULT_SAMPLE_SIZE = 10000
+DEFAULT_NULL_VALUES = ('',)
+
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+_BOOL_VALUES = {'true': True, 'false': False}
+#: integers joined by NUL characters, the values of a chunk are matched at once.
+_INTEGERS_PATTERN = re.compile(r'[-+]?\d+(?:\x00[-+]?\d+)*')
+
+
+def _parse_bool(value: str) -> bool:
+    return _BOOL_VALUES[value.lower()]
+
+
+def _parse_int(value: str) -> int:
+    return _parse_ints([value])[0]
+
+
+def _parse_bigint(value: str) -> int:
+    return _parse_bigints([value])[0]
+
+
+def _parse_float(value: str) -> float:
+    return _parse_floats([value])[0]
+
+
+def _parse_json(value: str) -> Any:
+    if not value.lstrip().startswith(('{', '[')):
+        raise ValueError(value)
+    return json.loads(value)
+
+
+def _parse_integers(values: Sequence[str], minimum: int, maximum: int) -> List[int]:
+    if values and not _INTEGERS_PATTERN.fullmatch('\x00'.join(values)):
+        raise ValueError('not an integer')
+    numbers = list(map(int, values))
+    if numbers and (min(numbers) < minimum or max(numbers) > maximum):
+        raise ValueError('out of range')
+    return numbers
+
+
+def _parse_ints(values: Sequence[str]) -> List[int]:
+    return _parse_integers(values, INT32_MIN, INT32_MAX)
+
+
+def _parse_bigints(values: Sequence[str]) -> List[int]:
+    return _parse_integers(values, INT64_MIN, INT64_MAX)
+
+
+def _parse_floats(values: Sequence[str]) -> List[float]:
+    numbers = list(map(float, values))
+    # nan and inf are not valid bounds of CHECK constraints
+    if not all(map(math.isfinite, numbers)):
+        raise ValueError('not a finite number')
+    return numbers
+
+
+#: candidate types, from the most to the least specific one.
+#: the first type whose parser accepts every value of a column wins.
+TYPE_PARSERS: List[Tuple[DBColumnType, Callable[[str], Any]]] = [
+    (DBColumnType.bool, _parse_bool),
+    (DBColumnType.int, _parse_int),
+    (DBColumnType.bigint, _parse_bigint),
+    (DBColumnType.float, _parse_float),
+    (DBColumnType.date, date.fromisoformat),
+    (DBColumnType.time, time.fromisoformat),
+    (DBColumnType.datetime, datetime.fromisoformat),
+    (DBColumnType.json, _parse_json),
+]
+
+#: parsers of a chunk of values, for the types checked faster than value by value.
+_CHUNK_PARSERS: Dict[DBColumnType, Callable[[Sequence[str]], List[Any]]] = {
+    DBColumnType.int: _parse_ints,
+    DBColumnType.bigint: _parse_bigints,
+    DBColumnType.float: _parse_floats,
+}
+
+_NUMERIC_TYPES = (DBColumnType.int, DBColumnType.bigint, DBColumnType.float)
+
+#: count of values of a column checked at once.
+CHUNK_SIZE = 4096
+
+
+def reservoir_sample(rows: Iterable[Sequence[str]],
+                     size: int = DEFAULT_SAMPLE_SIZE,
+                     seed: Optional[int] = None) -> Tuple[List[Sequence[str]], int]:
+    """Uniformly sample at most `size` rows out of `rows` in a single pass.
+
+    Returns:
+        - the sampled rows and the count of rows read.
+    """
+    if size < 1:
+        raise ValueError('sample size must be positive, got %r' % size)
+
+    # Algorithm L: the count of rows to skip before the next replacement is drawn,
+    # the skipped rows are consumed by `islice()` without a random number each
+    rng = random.Random(seed)
+    numbered = enumerate(rows, 1)
+    sample: List[Sequence[str]] = [row for _, row in itertools.islice(numbered, size)]
+    count = len(sample)
+    if count < size:
+        return sample, count
+    weight = math.exp(math.log(_random_open(rng)) / size)
+    while True:
+        skip = int(math.log(_random_open(rng)) / math.log1p(-weight))
+        skipped = collections.deque(itertools.islice(numbered, skip), maxlen=1)
+        if skipped:
+            count = skipped[0][0]
+        item = next(numbered, None)
+        if item is None:
+            return sample, count
+        count, sample[rng.randrange(size)] = item
+        weight *= math.exp(math.log(_random_open(rng)) / size)
+
+
+def _random_open(rng: random.Random) -> float:
+    """A random float in (0, 1)."""
+    value = rng.random()
+    while not value:
+        value = rng.random()
+    return value
+
+
+class ColumnStats:
+    """Exact statistics of a column, updated chunk by chunk in constant memory.
+
+    A type must accept every value, so each candidate type is checked against a whole chunk
+    of values at once (`map()` of its parser), and dropped at the first value it rejects.
+    """
+
+    def __init__(self, null_values: Sequence[str] = DEFAULT_NULL_VALUES) -> None:
+        self.null_values = frozenset(null_values)
+        self.count = 0
+        self.present = 0
+        #: indexes in `TYPE_PARSERS` of the types accepting every value so far.
+        self.candidates = list(range(len(TYPE_PARSERS)))
+        #: [minimum, maximum] of the values, per numeric candidate type.
+        self.bounds: Dict[DBColumnType, List[Any]] = {}
+        self.min_length: Optional[int] = None
+        self.max_length: Optional[int] = None
+        self._pending: List[Optional[str]] = []
+
+    def add(self, value: Optional[str]) -> None:
+        self._pending.append(value)
+        if len(self._pending) >= CHUNK_SIZE:
+            self.flush()
+
+    def add_many(self, values: Iterable[Optional[str]]) -> None:
+        self._pending.extend(values)
+        if len(self._pending) >= CHUNK_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Checks the pending values."""
+        chunk, self._pending = self._pending, []
+        self.count += len(chunk)
+        null_values = self.null_values
+        present = [value for value in chunk if value is not None and value not in null_values]
+        if not present:
+            return
+        self.present += len(present)
+
+        lengths = list(map(len, present))
+        min_length, max_length = min(lengths), max(lengths)
+        if self.min_length is None or min_length < self.min_length:
+            self.min_length = min_length
+        if self.max_length is None or max_length > self.max_length:
+            self.max_length = max_length
+
+        candidates = []
+        for i in self.candidates:
+            type_, parser = TYPE_PARSERS[i]
+            try:
+                if type_ in _CHUNK_PARSERS:
+                    parsed = _CHUNK_PARSERS[type_](present)
+                else:
+                    parsed = list(map(parser, present))
+            except (ValueError, TypeError, KeyError):
+                continue
+            candidates.append(i)
+            if type_ in _NUMERIC_TYPES:
+                low, high = min(parsed), max(parsed)
+                bounds = self.bounds.get(type_)
+                if bounds is None:
+                    self.bounds[type_] = [low, high]
+                else:
+                    bounds[0], bounds[1] = min(bounds[0], low), max(bounds[1], high)
+        self.candidates = candidates
+
+    @property
+    def type(self) -> DBColumnType:
+        self.flush()
+        if self.present and self.candidates:
+            return TYPE_PARSERS[self.candidates[0]][0]
+        return DBColumnType.str
+
+    def constraints(self) -> Dict[str, Any]:
+        """The constraints holding for every value, but `unique`."""
+        self.flush()
+        constraints: Dict[str, Any] = {}
+        if not self.present:
+            return constraints
+        type_ = self.type
+        if self.present == self.count:
+            constraints['required'] = True
+        if type_ in _NUMERIC_TYPES:
+            constraints['minimum'], constraints['maximum'] = self.bounds[type_]
+        elif type_ is DBColumnType.str:
+            constraints['minLength'] = self.min_length
+            constraints['maxLength'] = self.max_length
+        return constraints
+
+
+def _field(name: str,
+           stats: ColumnStats,
+           values: Sequence[Optional[str]],
+           complete: bool) -> Dict[str, Any]:
+    """`complete`: `values` are every value of the column, not a sample, so `unique` can be inferred."""
+    type_ = stats.type
+    constraints = stats.constraints()
+    present = [v for v in values if v is not None and v not in stats.null_values]
+    if (complete and present and len(set(present)) == len(present)
+            and type_ not in (DBColumnType.bool, DBColumnType.json)):
+        constraints['unique'] = True
+
+    field: Dict[str, Any] = {'name': name, 'type': type_.value}
+    if constraints:
+        field['constraints'] = constraints
+    return field
+
+
+def infer_column(name: str,
+                 values: Sequence[Optional[str]],
+                 null_values: Sequence[str] = DEFAULT_NULL_VALUES) -> Dict[str, Any]:
+    """Infer the field descriptor of one column from its values."""
+    stats = ColumnStats(null_values)
+    stats.add_many(values)
+    return _field(name, stats, values, complete=True)
+
+
+def infer_descriptor(rows: Iterable[Sequence[str]],
+                     name: str,
+                     headers: Optional[Sequence[str]] = None,
+                     sample_size: int = DEFAULT_SAMPLE_SIZE,
+                     seed: Optional[int] = None,
+                     null_values: Sequence[str] = DEFAULT_NULL_VALUES) -> Dict[str, Any]:
+    """Infer a table descriptor from rows of text values.
+
+    Args:
+        - rows: iterable of rows, consumed once. the first row is the header
+            unless `headers` is given.
+        - name: the table name.
+        - headers: the field names.
+        - sample_size: count of rows kept (reservoir-sampled) to infer `unique`, which is
+            only inferred when the input has no more rows than that.
+        - seed: seed of the sampling, for a reproducible descriptor.
+        - null_values: values regarded as missing.
+
+    Returns:
+        - dict: the table descriptor, can be loaded by `JSONTableSchema`.
+    """
+    rows = iter(rows)
+    if headers is None:
+        headers = next(rows, [])
+    headers = [h or 'field_%d' % i for i, h in enumerate(headers, 1)]
+
+    width = len(headers)
+    stats = [ColumnStats(null_values) for _ in headers]
+
+    def observe(rows: Iterator[Sequence[str]]) -> Iterator[List[Sequence[str]]]:
+        while True:
+            chunk = list(itertools.islice(rows, CHUNK_SIZE))
+            if not chunk:
+                return
+            longest = max(map(len, chunk))
+            if longest > width:
+                raise ValueError('row has %d values, but only %d headers' % (longest, width))
+            # short rows are padded with None
+            columns = list(itertools.zip_longest(*chunk))
+            for i, column in enumerate(stats):
+                column.add_many(columns[i] if i < len(columns) else [None] * len(chunk))
+            yield chunk
+
+    sample, count = reservoir_sample(itertools.chain.from_iterable(observe(rows)), sample_size, seed)
+
+    fields = []
+    for i, header in enumerate(headers):
+        sampled = [row[i] if i < len(row) else None for row in sample]
+        fields.append(_field(header, stats[i], sampled, complete=count <= sample_size))
+
+    return {'name': name, 'fields': fields}
+
+
+def infer_csv(path: str,
+              name: Optional[str] = None,
+              sample_size: int = DEFAULT_SAMPLE_SIZE,
+              seed: Optional[int] = None,
+              null_values: Sequence[str] = DEFAULT_NULL_VALUES,
+              encoding: str = 'utf-8',
+              **fmtparams: Any) -> Dict[str, Any]:
+    """Infer a table descriptor from a CSV file with a header row.
+
+    The table name defaults to the file name without its extension.
+    `fmtparams` are passed to `csv.reader`.
+    """
+    if name is None:
+        name = os.path.splitext(os.path.basename(path))[0]
+    with open(path, newline='', encoding=encoding) as fp:
+        return infer_descriptor(csv.reader(fp, **fmtparams), name,
+                                sample_size=sample_size,
+                                seed=seed,
+                                null_values=null_values)
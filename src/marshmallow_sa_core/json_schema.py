@@ -0,0 +1,179 @@
+"""JSON Schema of the descriptor format
+
+ref: https://json-schema.org/draft-07/schema
+
+- the JSON Schema of table descriptors, to validate them without marshmallow (e.g. with a
+  compiled JSON Schema validator in services and clients).
+
+The schema is shipped with the package (`table-descriptor.schema.json`), so it is read, not
+generated, at startup. It is regenerated from the marshmallow schemas with:
+
+    python -m marshmallow_sa_core.json_schema > src/marshmallow_sa_core/table-descriptor.schema.json
+
+The JSON Schema checks the structure of descriptors only, the checks done when building the
+table (e.g. the primary key fields exist) are not covered.
+"""
+
+import functools
+import json
+import os
+import sys
+from typing import Any
+from typing import Dict
+from typing import Type
+
+from marshmallow import RAISE
+from marshmallow import Schema
+from marshmallow import fields as ma_fields
+from marshmallow.utils import missing
+from marshmallow.validate import Length
+from marshmallow.validate import OneOf
+from marshmallow.validate import Range
+from marshmallow_enum import EnumField
+
+from marshmallow_sa_core.table_schema import JSONTableSchema
+
+JSON_SCHEMA_DRAFT = 'http://json-schema.org/draft-07/schema#'
+
+#: path of the JSON Schema shipped with the package.
+TABLE_DESCRIPTOR_JSON_SCHEMA_PATH = os.path.join(os.path.dirname(__file__), 'table-descriptor.schema.json')
+
+#: JSON types of the marshmallow fields, the most specific class wins.
+FIELD_TYPES = (
+    (ma_fields.Boolean, 'boolean'),
+    (ma_fields.Integer, 'integer'),
+    (ma_fields.Number, 'number'),
+    (ma_fields.String, 'string'),
+    (ma_fields.List, 'array'),
+    (ma_fields.Dict, 'object'),
+)
+
+
+def definition_name(schema: Type[Schema]) -> str:
+    """`JSONFieldSchema` is defined as `JSONField`."""
+    name = schema.__name__
+    return name[:-len('Schema')] if name.endswith('Schema') and name != 'Schema' else name
+
+
+def _apply_validators(field: ma_fields.Field, prop: Dict[str, Any]) -> None:
+    for validator in field.validators:
+        if isinstance(validator, Length):
+            keys = ('minItems', 'maxItems') if prop.get('type') == 'array' else ('minLength', 'maxLength')
+            if validator.equal is not None:
+                prop[keys[0]] = prop[keys[1]] = validator.equal
+            if validator.min is not None:
+                prop[keys[0]] = validator.min
+            if validator.max is not None:
+                prop[keys[1]] = validator.max
+        elif isinstance(validator, Range):
+            if validator.min is not None:
+                prop['exclusiveMinimum' if not validator.min_inclusive else 'minimum'] = validator.min
+            if validator.max is not None:
+                prop['exclusiveMaximum' if not validator.max_inclusive else 'maximum'] = validator.max
+        elif isinstance(validator, OneOf):
+            prop['enum'] = list(validator.choices)
+
+
+def field_to_json_schema(field: ma_fields.Field, definitions: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns the JSON Schema of a marshmallow field, adding nested schemas to `definitions`."""
+    if isinstance(field, ma_fields.Nested):
+        nested = field.nested if isinstance(field.nested, type) else type(field.nested)
+        prop = {'$ref': '#/definitions/%s' % schema_to_json_schema(nested, definitions)}
+        if field.many:
+            prop = {'type': 'array', 'items': prop}
+    elif isinstance(field, EnumField):
+        prop = {'type': 'string',
+                'enum': [member.value if field.by_value else member.name for member in field.enum]}
+    else:
+        prop = {}
+        for cls, json_type in FIELD_TYPES:
+            if isinstance(field, cls):
+                prop['type'] = json_type
+                break
+        if isinstance(field, ma_fields.List):
+            prop['items'] = field_to_json_schema(field.inner, definitions)
+        elif isinstance(field, ma_fields.Dict):
+            if field.key_field is not None:
+                keys = field_to_json_schema(field.key_field, definitions)
+                keys.pop('type', None)
+                if keys:
+                    prop['propertyNames'] = keys
+            if field.value_field is not None:
+                prop['additionalProperties'] = field_to_json_schema(field.value_field, definitions)
+
+    _apply_validators(field, prop)
+    if field.allow_none and 'type' in prop:
+        prop['type'] = [prop['type'], 'null']
+    for key in ('title', 'description'):
+        if key in field.metadata:
+            prop[key] = field.metadata[key]
+    if field.load_default is not missing and not callable(field.load_default):
+        prop['default'] = field.load_default
+    return prop
+
+
+def schema_to_json_schema(schema: Type[Schema], definitions: Dict[str, Any]) -> str:
+    """Adds the JSON Schema of a marshmallow schema to `definitions`, returns its definition name."""
+    name = definition_name(schema)
+    if name in definitions:
+        return name
+    definition: Dict[str, Any] = {'type': 'object'}
+    definitions[name] = definition  # before the fields, for recursive schemas
+    if schema.__doc__:
+        definition['description'] = schema.__doc__.strip().splitlines()[0]
+
+    properties = {}
+    required = []
+    for field_name, field in schema._declared_fields.items():
+        if field.dump_only:
+            continue
+        key = field.data_key or field_name
+        properties[key] = field_to_json_schema(field, definitions)
+        if field.required:
+            required.append(key)
+    definition['properties'] = properties
+    if required:
+        definition['required'] = required
+    if schema.opts.unknown == RAISE:
+        definition['additionalProperties'] = False
+    return name
+
+
+def generate_json_schema(schema: Type[Schema] = JSONTableSchema) -> Dict[str, Any]:
+    """Generates the JSON Schema of a marshmallow schema (e.g. a subclass of `JSONTableSchema`)."""
+    definitions: Dict[str, Any] = {}
+    name = schema_to_json_schema(schema, definitions)
+    return {
+        '$schema': JSON_SCHEMA_DRAFT,
+        'title': name,
+        '$ref': '#/definitions/%s' % name,
+        'definitions': definitions,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def table_descriptor_json_schema_text() -> str:
+    """Returns the JSON Schema of table descriptors, as JSON text."""
+    try:
+        with open(TABLE_DESCRIPTOR_JSON_SCHEMA_PATH, encoding='utf-8') as fp:
+            return fp.read()
+    except FileNotFoundError:  # pragma: no cover
+        return dumps(generate_json_schema(JSONTableSchema))
+
+
+@functools.lru_cache(maxsize=None)
+def table_descriptor_json_schema() -> Dict[str, Any]:
+    """
+    Returns the JSON Schema of table descriptors.
+
+    The schema is cached and shared, it must not be mutated.
+    """
+    return json.loads(table_descriptor_json_schema_text())
+
+
+def dumps(json_schema: Dict[str, Any]) -> str:
+    return json.dumps(json_schema, indent=2, ensure_ascii=False) + '\n'
+
+
+if __name__ == '__main__':
+    sys.stdout.write(dumps(generate_json_schema(JSONTableSchema)))
@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 
 from marshmallow import Schema
+from marshmallow import ValidationError
 from marshmallow import fields
 from marshmallow import post_load
 from marshmallow import post_dump
@@ -9,11 +10,21 @@ from marshmallow import validate
 from marshmallow.validate import Length
 from sqlalchemy import Column
 from sqlalchemy import CheckConstraint
+from sqlalchemy import Index
 from sqlalchemy import PrimaryKeyConstraint
 from sqlalchemy import UniqueConstraint
+from sqlalchemy import text
+from sqlalchemy.dialects import registry as dialect_registry
+from sqlalchemy.exc import ArgumentError
+from sqlalchemy.exc import CompileError
+from sqlalchemy.sql.elements import TextClause
 
 from marshmallow_sa_core.utilities.const import COLUMNTYPE_TO_SA_TYPE_MAPPING
+from marshmallow_sa_core.utilities.const import column_type_of
+from marshmallow_sa_core.utilities.intern import intern_name
+from marshmallow_sa_core.utilities.intern import shared_type
 from marshmallow_sa_core.utilities.schema import ObjectSchema
+from marshmallow_sa_core.utilities.schema import get_option
 
 if TYPE_CHECKING:
     from sqlalchemy.sql.type_api import TypeEngine
@@ -46,18 +57,25 @@ class ColumnSchema(Schema):
     unique = fields.Boolean()
 
     def get_type(self, obj):
-        for type_as_str, sa_col_type in self.context.get('type_mapping', COLUMNTYPE_TO_SA_TYPE_MAPPING).items():
-            if isinstance(obj['type'], sa_col_type):
-                return type_as_str
+        return column_type_of(obj['type'], get_option(self, 'type_mapping', COLUMNTYPE_TO_SA_TYPE_MAPPING))
 
     def load_type(self, type_) -> 'TypeEngine':
-        return self.context.get('type_mapping', COLUMNTYPE_TO_SA_TYPE_MAPPING)[type_]
+        type_mapping = get_option(self, 'type_mapping', COLUMNTYPE_TO_SA_TYPE_MAPPING)
+        if type_ not in type_mapping:
+            # type mapping can be keyed by the value of `DBColumnType`
+            type_ = getattr(type_, 'value', type_)
+        sa_type = type_mapping[type_]
+        if get_option(self, 'intern'):
+            sa_type = shared_type(sa_type)
+        return sa_type
 
     @post_load
     def create_object(self, data, **kw) -> Column:
         # place hold args
         name = data.pop('name')
         type_ = data.pop('type')
+        if get_option(self, 'intern'):
+            name = intern_name(name)
         args = data.pop('checks', [])
         return Column(*([name, type_] + args), **data)
 
@@ -104,3 +122,68 @@ class PrimaryKeyConstraintSchema(ObjectSchema):
         if pk_constraint.name:
             serialized['name'] = pk_constraint.name
         return serialized
+
+
+class IndexSchema(ObjectSchema):
+    class Meta:
+        object_class = Index
+
+    columns = fields.List(
+        fields.String(validate=Length(min=1)),
+        required=True,
+        validate=Length(min=1))
+    name = fields.String(required=False, validate=Length(min=1))
+    unique = fields.Boolean()
+    dialect_kwargs = fields.Dict(keys=fields.String(validate=Length(min=1)),
+                                 metadata={'description': "e.g. {'postgresql_using': 'gin'}"})
+
+    @post_load
+    def create_object(self, data: dict, **_) -> Index:
+        kwargs = {}
+        for key, value in data.get('dialect_kwargs', {}).items():
+            if key.endswith('_where') and isinstance(value, str):
+                value = text(value)
+            kwargs[key] = value
+        try:
+            return Index(data.get('name', None), *data['columns'],
+                         unique=data.get('unique', False), **kwargs)
+        except ArgumentError as exc:
+            raise ValidationError(str(exc), 'dialect_kwargs') from exc
+
+    @staticmethod
+    def is_functional(index: Index) -> bool:
+        """Whether the index has expressions other than columns, which can not be dumped."""
+        return not all(isinstance(expr, Column) for expr in index.expressions)
+
+    @staticmethod
+    def where_to_text(key: str, where) -> str:
+        """Returns the SQL of a partial index condition, with bound values rendered inline."""
+        if isinstance(where, TextClause):
+            return where.text
+        dialect = dialect_registry.load(key[:-len('_where')])()
+        try:
+            return str(where.compile(dialect=dialect, compile_kwargs={'literal_binds': True, 'include_table': False}))
+        except CompileError as exc:
+            raise ValueError('can not dump the condition of the partial index: %s' % exc) from exc
+
+    @pre_dump
+    def jsonable_encoder(self, index: Index, **_) -> dict:
+        if self.is_functional(index):
+            raise ValueError('can not dump the functional index %r, only indexes of columns are supported'
+                             % index.name)
+        serialized = {
+            'columns': [col.name for col in index.columns],
+        }
+        if index.name:
+            serialized['name'] = index.name
+        if index.unique:
+            serialized['unique'] = True
+
+        dialect_kwargs = {}
+        for key, value in index.dialect_kwargs.items():
+            if key.endswith('_where') and value is not None:
+                value = self.where_to_text(key, value)
+            dialect_kwargs[key] = value
+        if dialect_kwargs:
+            serialized['dialect_kwargs'] = dialect_kwargs
+        return serialized
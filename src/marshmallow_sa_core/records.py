@@ -0,0 +1,173 @@
+"""NumPy Records
+
+- map a table descriptor (or a SQLAlchemy Table) to a NumPy structured dtype.
+- fill preallocated record arrays from a result, chunk by chunk, with masks for NULL.
+
+requires numpy: `pip install marshmallow-sa-core[numpy]`
+"""
+
+import datetime
+from typing import Any
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise ImportError('marshmallow_sa_core.records requires numpy, '
+                      'install it with `pip install marshmallow-sa-core[numpy]`') from exc
+
+from sqlalchemy import String
+from sqlalchemy import Table
+
+from marshmallow_sa_core.utilities.const import COLUMNTYPE_TO_SA_TYPE_MAPPING
+from marshmallow_sa_core.utilities.const import column_type_of
+from marshmallow_sa_core.utilities.enum import DBColumnType
+
+DEFAULT_CHUNK_SIZE = 10000
+
+#: NumPy type of each column type, `str` is a fixed width unicode string when its max
+#: length is known, and an object otherwise.
+COLUMNTYPE_TO_NUMPY_TYPE_MAPPING = {
+    DBColumnType.bool: np.dtype('?'),
+    DBColumnType.int: np.dtype('<i4'),
+    DBColumnType.bigint: np.dtype('<i8'),
+    DBColumnType.float: np.dtype('<f8'),
+    DBColumnType.date: np.dtype('datetime64[D]'),
+    DBColumnType.datetime: np.dtype('datetime64[us]'),
+    DBColumnType.time: np.dtype('timedelta64[us]'),
+    DBColumnType.json: np.dtype('O'),
+    DBColumnType.str: np.dtype('O'),
+}
+
+Source = Union[Table, dict]
+
+
+def _fields(source: Source, type_mapping=COLUMNTYPE_TO_SA_TYPE_MAPPING) -> List[Tuple[str, DBColumnType, Optional[int], bool]]:
+    """(name, type, max length, nullable) of each field of a table or a table descriptor."""
+    if isinstance(source, Table):
+        fields = []
+        for column in source.columns:
+            type_ = column_type_of(column.type, type_mapping)
+            if type_ is None:
+                raise ValueError('can not map the type %r of column %r' % (column.type, column.name))
+            length = column.type.length if isinstance(column.type, String) else None
+            fields.append((column.name, type_, length, bool(column.nullable)))
+        return fields
+
+    fields = []
+    for field in source['fields']:
+        constraints = field.get('constraints', {})
+        fields.append((field['name'],
+                       DBColumnType(field['type']),
+                       constraints.get('maxLength'),
+                       not constraints.get('required', False)))
+    return fields
+
+
+def to_dtype(source: Source, type_mapping=COLUMNTYPE_TO_SA_TYPE_MAPPING) -> 'np.dtype':
+    """Returns the structured dtype of a table or a table descriptor."""
+    descr = []
+    for name, type_, length, _ in _fields(source, type_mapping):
+        if type_ is DBColumnType.str and length:
+            dtype = np.dtype('<U%d' % length)
+        else:
+            try:
+                dtype = COLUMNTYPE_TO_NUMPY_TYPE_MAPPING[type_]
+            except KeyError:
+                raise ValueError('no NumPy type for %s field %r' % (type_, name)) from None
+        descr.append((name, dtype))
+    return np.dtype(descr)
+
+
+def nullable_fields(source: Source, type_mapping=COLUMNTYPE_TO_SA_TYPE_MAPPING) -> List[str]:
+    return [name for name, _, _, nullable in _fields(source, type_mapping) if nullable]
+
+
+def _null_value(dtype: 'np.dtype') -> Any:
+    if dtype.kind == 'f':
+        return np.nan
+    if dtype.kind == 'M':
+        return np.datetime64('NaT')
+    if dtype.kind == 'm':
+        return np.timedelta64('NaT')
+    if dtype.kind == 'U':
+        return ''
+    if dtype.kind == 'O':
+        return None
+    return 0
+
+
+def _time_to_microseconds(value: datetime.time) -> int:
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+
+
+def _column_positions(keys: Sequence[str], dtype: 'np.dtype') -> List[Tuple[str, int]]:
+    keys = list(keys)
+    try:
+        return [(name, keys.index(name)) for name in dtype.names]
+    except ValueError:
+        missing = [name for name in dtype.names if name not in keys]
+        raise ValueError('fields missing from the result: %s' % ', '.join(missing)) from None
+
+
+def fill_records(rows: Sequence[Sequence[Any]],
+                 out: 'np.ndarray',
+                 positions: Sequence[Tuple[str, int]],
+                 mask: Optional['np.ndarray'] = None) -> int:
+    """
+    Fills the first rows of `out`, column by column, and marks NULL values in `mask`.
+
+    Args:
+        - rows: rows of values, at most `len(out)`.
+        - out: the preallocated structured array.
+        - positions: (field name, position in the row) of each field to fill.
+        - mask: the preallocated mask (dtype from `numpy.ma.make_mask_descr`).
+
+    Returns:
+        - int: the count of filled rows.
+    """
+    n = len(rows)
+    for name, position in positions:
+        field = out[name]
+        values = [row[position] for row in rows]
+        nulls = [v is None for v in values]
+        if field.dtype.kind == 'm':
+            values = [None if v is None else _time_to_microseconds(v) for v in values]
+        if field.dtype.kind != 'O' and True in nulls:
+            null = _null_value(field.dtype)
+            values = [null if v is None else v for v in values]
+        field[:n] = values
+        if mask is not None:
+            mask[name][:n] = nulls
+    return n
+
+
+def iter_records(result, dtype: 'np.dtype', chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator['np.ma.MaskedArray']:
+    """
+    Yields the rows of a result as masked record arrays of at most `chunk_size` rows.
+
+    The arrays are views of one preallocated buffer which is refilled for the next chunk,
+    copy a chunk to keep it.
+    """
+    positions = _column_positions(result.keys(), dtype)
+    out = np.empty(chunk_size, dtype=dtype)
+    mask = np.zeros(chunk_size, dtype=np.ma.make_mask_descr(dtype))
+    while True:
+        rows = result.fetchmany(chunk_size)
+        if not rows:
+            return
+        n = fill_records(rows, out, positions, mask)
+        yield np.ma.masked_array(out[:n], mask=mask[:n], copy=False)
+
+
+def fetch_records(result, dtype: 'np.dtype', chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'np.ma.MaskedArray':
+    """Fetches all rows of a result into one masked record array."""
+    chunks = [chunk.copy() for chunk in iter_records(result, dtype, chunk_size)]
+    if not chunks:
+        return np.ma.masked_array(np.empty(0, dtype=dtype))
+    return np.ma.concatenate(chunks)
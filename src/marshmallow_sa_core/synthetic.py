@@ -0,0 +1,294 @@
+"""Synthetic Data
+
+- generate rows satisfying the constraints of a table descriptor, for load tests and benchmarks.
+
+Rows are generated column by column, in batches of NumPy (masked) arrays. The same seed
+and the same batch sizes generate the same rows.
+
+Constraints:
+    - required: non-required fields are NULL with a probability of `null_fraction`.
+    - unique: values (and the first primary key field) are generated from the row index, up to
+      the bounds of the column type (e.g. int32) when not constrained.
+    - minimum / maximum: bounds of int, bigint and float values.
+    - minLength / maxLength: bounds of the length of str values.
+
+requires numpy: `pip install marshmallow-sa-core[numpy]`
+"""
+
+import datetime
+import string
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise ImportError('marshmallow_sa_core.synthetic requires numpy, '
+                      'install it with `pip install marshmallow-sa-core[numpy]`') from exc
+
+from marshmallow_sa_core.utilities.enum import DBColumnType
+
+DEFAULT_BATCH_SIZE = 100000
+
+#: (minimum, maximum) of the values of each numeric type, when not constrained.
+DEFAULT_RANGES = {
+    DBColumnType.int: (0, 1000000),
+    DBColumnType.bigint: (0, 10 ** 12),
+    DBColumnType.float: (0.0, 1000000.0),
+}
+
+#: (minimum, maximum) of the values of each integer type, the bounds of unique values when not constrained.
+TYPE_RANGES = {
+    DBColumnType.int: (-2 ** 31, 2 ** 31 - 1),
+    DBColumnType.bigint: (-2 ** 63, 2 ** 63 - 1),
+}
+
+#: default max length of str values.
+DEFAULT_MAX_LENGTH = 32
+
+#: dates and datetimes are generated in [DATE_MIN, DATE_MAX).
+DATE_MIN = np.datetime64('2000-01-01', 'D')
+DATE_MAX = np.datetime64('2030-01-01', 'D')
+#: unique dates and datetimes are generated in [DATE_MIN, UNIQUE_DATE_MAX), the range of `datetime.date`.
+UNIQUE_DATE_MAX = np.datetime64('9999-12-31', 'D') + np.timedelta64(1, 'D')
+
+_ALPHABET = np.frombuffer((string.ascii_letters + string.digits).encode('utf-32-le'), dtype='<u4')
+_DIGITS = np.frombuffer(string.digits.encode('utf-32-le'), dtype='<u4')
+
+#: count of distinct random str values per batch, drawn once and sampled for each row.
+STR_POOL_SIZE = 16384
+
+#: count of distinct unique float values in [minimum, maximum], when the range is wide enough.
+_FLOAT_SLOTS = 2 ** 32
+
+
+class FieldSpec(NamedTuple):
+    name: str
+    type: DBColumnType
+    nullable: bool
+    unique: bool
+    minimum: Optional[float]
+    maximum: Optional[float]
+    min_length: int
+    max_length: int
+
+
+def field_specs(descriptor: dict) -> List[FieldSpec]:
+    """Reads the generated fields and their constraints from a table descriptor."""
+    primary_key = descriptor.get('primaryKey') or []
+    specs = []
+    for field in descriptor['fields']:
+        name = field['name']
+        constraints = field.get('constraints', {})
+        type_ = DBColumnType(field['type'])
+        if type_ not in GENERATORS:
+            raise ValueError('can not generate %s field %r' % (type_, name))
+
+        unique = bool(constraints.get('unique')) or (bool(primary_key) and name == primary_key[0])
+        minimum = maximum = None
+        if unique and type_ in TYPE_RANGES:
+            # unique values count from the minimum (0 by default), as far as the type allows
+            type_min, type_max = TYPE_RANGES[type_]
+            low = DEFAULT_RANGES[type_][0]
+            maximum = constraints.get('maximum', type_max)
+            minimum = constraints.get('minimum', low if maximum >= low else type_min)
+        elif type_ in DEFAULT_RANGES:
+            # a single bound shifts the default range
+            low, high = DEFAULT_RANGES[type_]
+            minimum = constraints.get('minimum')
+            maximum = constraints.get('maximum')
+            if minimum is None:
+                minimum = low if maximum is None else maximum - (high - low)
+            if maximum is None:
+                maximum = minimum + (high - low)
+        min_length = constraints.get('minLength') or 0
+        max_length = constraints.get('maxLength') or max(DEFAULT_MAX_LENGTH, min_length)
+        if (minimum is not None and minimum > maximum) or min_length > max_length:
+            raise ValueError('field %r has no valid value' % name)
+
+        specs.append(FieldSpec(
+            name=name,
+            type=type_,
+            nullable=not constraints.get('required', False) and name not in primary_key,
+            unique=unique,
+            minimum=minimum,
+            maximum=maximum,
+            min_length=min_length,
+            max_length=max_length,
+        ))
+    return specs
+
+
+def _check_unique_range(spec: FieldSpec, index: 'np.ndarray', capacity: int) -> None:
+    if len(index) and index[-1] >= capacity:
+        raise ValueError('field %r can not hold more than %d unique values' % (spec.name, capacity))
+
+
+def _generate_bool(rng, spec: FieldSpec, index: 'np.ndarray') -> 'np.ndarray':
+    if spec.unique:
+        _check_unique_range(spec, index, 2)
+        return index.astype(bool)
+    return rng.random(len(index)) < 0.5
+
+
+def _generate_integer(dtype: str):
+    def generate(rng, spec: FieldSpec, index: 'np.ndarray') -> 'np.ndarray':
+        low, high = int(np.ceil(spec.minimum)), int(np.floor(spec.maximum))
+        if spec.unique:
+            _check_unique_range(spec, index, high - low + 1)
+            return (low + index).astype(dtype)
+        return rng.integers(low, high, size=len(index), dtype=dtype, endpoint=True)
+    return generate
+
+
+def _float_to_ordinal(value: float) -> int:
+    """Maps floats to integers of the same order, adjacent floats to adjacent integers."""
+    bits = int(np.float64(value).view(np.int64))
+    return bits if bits >= 0 else -(bits & 0x7FFFFFFFFFFFFFFF)
+
+
+def _ordinal_to_float(ordinals: 'np.ndarray') -> 'np.ndarray':
+    bits = np.where(ordinals >= 0, ordinals, -ordinals | np.iinfo(np.int64).min)
+    return bits.astype(np.int64).view(np.float64)
+
+
+def _generate_float(rng, spec: FieldSpec, index: 'np.ndarray') -> 'np.ndarray':
+    if spec.unique:
+        step = (spec.maximum - spec.minimum) / _FLOAT_SLOTS
+        if step >= 2 * np.spacing(max(abs(spec.minimum), abs(spec.maximum))):
+            _check_unique_range(spec, index, _FLOAT_SLOTS)
+            return spec.minimum + index * step
+        # too narrow a range for evenly spaced values, each float of it in turn
+        low = _float_to_ordinal(spec.minimum)
+        _check_unique_range(spec, index, _float_to_ordinal(spec.maximum) - low + 1)
+        return _ordinal_to_float(low + index)
+    return rng.uniform(spec.minimum, spec.maximum, size=len(index))
+
+
+def _generate_str(rng, spec: FieldSpec, index: 'np.ndarray') -> 'np.ndarray':
+    n, width = len(index), spec.max_length
+    if spec.unique:
+        # the zero padded row index, as short as the length constraints allow
+        width = min(max(spec.min_length, 10), spec.max_length)
+        _check_unique_range(spec, index, 10 ** width)
+        powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+        codes = _DIGITS[(index[:, None] // powers) % 10]
+    else:
+        pool_size = min(n, STR_POOL_SIZE)
+        codes = _ALPHABET[rng.integers(0, len(_ALPHABET), size=(pool_size, width), dtype=np.uint8)]
+        if spec.min_length < width:
+            lengths = rng.integers(max(spec.min_length, 1), width, size=pool_size, endpoint=True)
+            # trailing NUL characters are stripped by NumPy unicode strings
+            codes[np.arange(width) >= lengths[:, None]] = 0
+        if pool_size < n:
+            pool = np.ascontiguousarray(codes).view('<U%d' % width).reshape(pool_size)
+            return pool[rng.integers(0, pool_size, size=n)]
+    return np.ascontiguousarray(codes).view('<U%d' % width).reshape(n)
+
+
+def _generate_date(rng, spec: FieldSpec, index: 'np.ndarray') -> 'np.ndarray':
+    if spec.unique:
+        _check_unique_range(spec, index, int((UNIQUE_DATE_MAX - DATE_MIN) / np.timedelta64(1, 'D')))
+        return DATE_MIN + index.astype('timedelta64[D]')
+    days = int((DATE_MAX - DATE_MIN) / np.timedelta64(1, 'D'))
+    return DATE_MIN + rng.integers(0, days, size=len(index)).astype('timedelta64[D]')
+
+
+def _generate_datetime(rng, spec: FieldSpec, index: 'np.ndarray') -> 'np.ndarray':
+    start = DATE_MIN.astype('datetime64[us]')
+    if spec.unique:
+        _check_unique_range(spec, index, int((UNIQUE_DATE_MAX - DATE_MIN) / np.timedelta64(1, 's')))
+        offsets = index
+    else:
+        offsets = rng.integers(0, int((DATE_MAX - DATE_MIN) / np.timedelta64(1, 's')), size=len(index))
+    return start + (offsets * 1000000).astype('timedelta64[us]')
+
+
+def _generate_time(rng, spec: FieldSpec, index: 'np.ndarray') -> 'np.ndarray':
+    microseconds = 24 * 3600 * 1000000
+    if spec.unique:
+        _check_unique_range(spec, index, microseconds)
+        return index.astype('timedelta64[us]')
+    return rng.integers(0, microseconds, size=len(index)).astype('timedelta64[us]')
+
+
+def _generate_json(rng, spec: FieldSpec, index: 'np.ndarray') -> 'np.ndarray':
+    values = index if spec.unique else rng.integers(0, DEFAULT_RANGES[DBColumnType.int][1], size=len(index))
+    out = np.empty(len(index), dtype=object)
+    out[:] = [{'n': value} for value in values.tolist()]
+    return out
+
+
+#: generator of each column type: (rng, field spec, row index) -> values.
+#: time values are `timedelta64` since midnight, like in `records`.
+GENERATORS = {
+    DBColumnType.bool: _generate_bool,
+    DBColumnType.int: _generate_integer('<i4'),
+    DBColumnType.bigint: _generate_integer('<i8'),
+    DBColumnType.float: _generate_float,
+    DBColumnType.str: _generate_str,
+    DBColumnType.date: _generate_date,
+    DBColumnType.datetime: _generate_datetime,
+    DBColumnType.time: _generate_time,
+    DBColumnType.json: _generate_json,
+}
+
+
+class SyntheticData:
+    """
+    Generates rows of a table descriptor.
+
+    >>> data = SyntheticData(descriptor, seed=42)
+    >>> for rows in data.iter_rows(1000000, batch_size=10000):
+    ...     connection.execute(table.insert(), rows)
+    """
+
+    def __init__(self, descriptor: dict, seed: Optional[int] = None, null_fraction: float = 0.1) -> None:
+        self.specs = field_specs(descriptor)
+        self.null_fraction = null_fraction
+        self.rng = np.random.default_rng(seed)
+        #: index of the next generated row.
+        self.position = 0
+
+    def batch(self, size: int) -> Dict[str, 'np.ma.MaskedArray']:
+        """Returns the next `size` rows, as a masked array per field (masked values are NULL)."""
+        index = np.arange(self.position, self.position + size, dtype=np.int64)
+        columns = {}
+        for spec in self.specs:
+            values = GENERATORS[spec.type](self.rng, spec, index)
+            mask = np.ma.nomask
+            if spec.nullable and self.null_fraction:
+                mask = self.rng.random(size) < self.null_fraction
+            columns[spec.name] = np.ma.masked_array(values, mask=mask)
+        self.position += size
+        return columns
+
+    def iter_batches(self, rows: int, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, 'np.ma.MaskedArray']]:
+        """Yields the next `rows` rows, in batches of at most `batch_size` rows."""
+        for start in range(0, rows, batch_size):
+            yield self.batch(min(batch_size, rows - start))
+
+    def iter_rows(self, rows: int, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """Yields the next `rows` rows as lists of dicts of Python values, e.g. for `table.insert()`."""
+        for columns in self.iter_batches(rows, batch_size):
+            yield batch_to_rows(columns)
+
+
+def _to_time(value: Optional[datetime.timedelta]) -> Optional[datetime.time]:
+    return None if value is None else (datetime.datetime.min + value).time()
+
+
+def batch_to_rows(columns: Dict[str, 'np.ma.MaskedArray']) -> List[Dict[str, Any]]:
+    """Converts a batch to a list of dicts, NULL is None."""
+    names = list(columns)
+    values = []
+    for column in columns.values():
+        converted = column.tolist(None)
+        if column.dtype.kind == 'm':
+            converted = [_to_time(value) for value in converted]
+        values.append(converted)
+    return [dict(zip(names, row)) for row in zip(*values)]
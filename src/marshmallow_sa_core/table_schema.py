@@ -6,26 +6,55 @@ ref: https://specs.frictionlessdata.io/table-schema/#types-and-formats
 - dump SQLAlchemy Table to jsonable table data.
 """
 
+import warnings
 from typing import Any
 from typing import Dict
+from typing import Optional
 from marshmallow import Schema
 from marshmallow import fields as ma_fields
+from marshmallow import ValidationError
 from marshmallow import post_load
 from marshmallow import pre_dump
+from marshmallow import pre_load
 from marshmallow.validate import Length
+from marshmallow.validate import OneOf
+from marshmallow.validate import Range
 from marshmallow_enum import EnumField
 
 from sqlalchemy import Column
+from sqlalchemy import Index
 from sqlalchemy import MetaData
 from sqlalchemy import Table
+from sqlalchemy.exc import ArgumentError
 
+from marshmallow_sa_core.utilities.migration import MigrationRegistry
 from marshmallow_sa_core.utilities.schema import ObjectSchema
 from marshmallow_sa_core.utilities.const import COLUMNTYPE_TO_SA_TYPE_MAPPING
+from marshmallow_sa_core.utilities.ddl import format_storage_parameters
+from marshmallow_sa_core.utilities.dump_cache import dump_cache
 from marshmallow_sa_core.utilities.enum import DBColumnType as ColumnTypeEnum
+from marshmallow_sa_core.utilities.intern import intern_name
+from marshmallow_sa_core.utilities.intern import intern_string
 
 from .ma_sa_core import ColumnSchema as SAColumnSchema
+from .ma_sa_core import IndexSchema
 from .ma_sa_core import PrimaryKeyConstraintSchema
 
+#: migrations of table descriptors written by older versions.
+#: register a step with `@table_migrations.register(from_version, to_version)`.
+table_migrations = MigrationRegistry()
+
+# schemas are re-entrant (options are per call), instances are shared
+_column_schema = SAColumnSchema()
+_pk_constraint_schema = PrimaryKeyConstraintSchema()
+_index_schema = IndexSchema()
+
+#: dialects supporting partial indexes, the `where` of an index descriptor applies to them.
+PARTIAL_INDEX_DIALECTS = ('postgresql', 'sqlite')
+
+#: accepted `CREATE <prefix> TABLE` prefixes.
+TABLE_PREFIXES = ('TEMPORARY', 'UNLOGGED')
+
 
 class ConstraintsSchema(Schema):
     required = ma_fields.Boolean()
@@ -76,7 +105,7 @@ class JSONFieldSchema(ObjectSchema):
         self.constraints_as_sa_column_kwargs(data)
         if 'description' in data:
             data['comment'] = data.pop('description')
-        return SAColumnSchema().load(data)
+        return _column_schema.load(data)
 
     def constraints_as_sa_column_kwargs(self, data: dict) -> None:
         if 'constraints' not in data:
@@ -97,12 +126,14 @@ class JSONFieldSchema(ObjectSchema):
         sa_check_data: List[Dict[str, str]] = []
         for constraint, value in checks.items():
             sqltext = sqltexts[constraint] % (column_name, value)
+            if self.get_option('intern'):
+                sqltext = intern_string(sqltext)
             sa_check_data.append({'sqltext': sqltext})
         return sa_check_data
 
     @pre_dump
     def jsonable_encoder(self, column: Column, **_) -> dict:
-        serialized = SAColumnSchema().dump(column)
+        serialized = _column_schema.dump(column)
 
         constraints = {}
         for check in serialized.pop('checks', []):
@@ -131,14 +162,153 @@ class ForeignKeySchema(Schema):
     reference = ma_fields.Nested(ReferenceSchema, required=True)
 
 
+class JSONIndexSchema(Schema):
+    """Index Descriptors"""
+
+    name = ma_fields.String(validate=Length(min=1),
+                            metadata={'description': "the index name, "
+                                                     "named by the naming convention of MetaData if omitted"})
+    fields = ma_fields.List(ma_fields.String(validate=Length(min=1)),
+                            required=True,
+                            validate=Length(min=1))
+    unique = ma_fields.Boolean()
+    where = ma_fields.String(validate=Length(min=1),
+                             metadata={'description': "SQL condition of a partial index"})
+    dialectOptions = ma_fields.Dict(keys=ma_fields.String(validate=Length(min=1)),
+                                    values=ma_fields.Dict(keys=ma_fields.String(validate=Length(min=1))),
+                                    metadata={'description': "e.g. {'postgresql': {'using': 'gin'}}"})
+
+    @post_load
+    def index_to_sa_index_kwargs(self, index: dict, **_) -> dict:
+        dialect_kwargs = {}
+        for dialect, options in index.pop('dialectOptions', {}).items():
+            for key, value in options.items():
+                dialect_kwargs['%s_%s' % (dialect, key)] = value
+        if 'where' in index:
+            where = index.pop('where')
+            for dialect in PARTIAL_INDEX_DIALECTS:
+                dialect_kwargs['%s_where' % dialect] = where
+
+        kwargs = {'columns': index.pop('fields'), **index}
+        if dialect_kwargs:
+            kwargs['dialect_kwargs'] = dialect_kwargs
+        return kwargs
+
+    @pre_dump
+    def jsonable_encoder(self, index: Index, **_) -> dict:
+        dumped = _index_schema.dump(index)
+        serialized = {'fields': dumped['columns']}
+        for key in ('name', 'unique'):
+            if key in dumped:
+                serialized[key] = dumped[key]
+
+        dialect_kwargs = dumped.get('dialect_kwargs', {})
+        wheres = {dialect_kwargs.get('%s_where' % dialect) for dialect in PARTIAL_INDEX_DIALECTS}
+        if len(wheres) == 1 and None not in wheres:
+            serialized['where'] = wheres.pop()
+            for dialect in PARTIAL_INDEX_DIALECTS:
+                del dialect_kwargs['%s_where' % dialect]
+
+        dialect_options = {}
+        for key, value in dialect_kwargs.items():
+            dialect, option = key.split('_', 1)
+            dialect_options.setdefault(dialect, {})[option] = value
+        if dialect_options:
+            serialized['dialectOptions'] = dialect_options
+        return serialized
+
+
+class JSONStorageSchema(Schema):
+    """Storage Descriptors, dialect specific options of the table"""
+
+    prefixes = ma_fields.List(ma_fields.String(validate=OneOf(TABLE_PREFIXES)),
+                              metadata={'description': "e.g. ['UNLOGGED'] for staging tables"})
+    tablespace = ma_fields.String(validate=Length(min=1),
+                                  metadata={'description': "PostgreSQL tablespace"})
+    partitionBy = ma_fields.String(validate=Length(min=1),
+                                   metadata={'description': "PostgreSQL partitioning, e.g. 'RANGE (created_at)'"})
+    fillfactor = ma_fields.Integer(validate=Range(min=10, max=100),
+                                   metadata={'description': "PostgreSQL fillfactor storage parameter"})
+    dialectOptions = ma_fields.Dict(keys=ma_fields.String(validate=Length(min=1)),
+                                    values=ma_fields.Dict(keys=ma_fields.String(validate=Length(min=1))),
+                                    metadata={'description': "e.g. {'sqlite': {'with_rowid': false}}"})
+
+    @post_load
+    def storage_to_sa_table_kwargs(self, storage: dict, **_) -> dict:
+        dialect_kwargs = {}
+        for dialect, options in storage.pop('dialectOptions', {}).items():
+            for key, value in options.items():
+                dialect_kwargs['%s_%s' % (dialect, key)] = value
+        if 'tablespace' in storage:
+            dialect_kwargs['postgresql_tablespace'] = storage['tablespace']
+        if 'partitionBy' in storage:
+            dialect_kwargs['postgresql_partition_by'] = storage['partitionBy']
+        if 'fillfactor' in storage:
+            dialect_kwargs['postgresql_with'] = dict(dialect_kwargs.get('postgresql_with') or {},
+                                                     fillfactor=storage['fillfactor'])
+        if dialect_kwargs.get('postgresql_with'):
+            try:
+                format_storage_parameters(dialect_kwargs['postgresql_with'])
+            except (ValueError, AttributeError) as exc:
+                raise ValidationError(str(exc), 'dialectOptions') from exc
+
+        kwargs = {'dialect_kwargs': dialect_kwargs}
+        if 'prefixes' in storage:
+            kwargs['prefixes'] = storage['prefixes']
+        return kwargs
+
+    @pre_dump
+    def jsonable_encoder(self, table: Table, **_) -> dict:
+        serialized = {}
+        if table._prefixes:
+            serialized['prefixes'] = list(table._prefixes)
+
+        dialect_kwargs = dict(table.dialect_kwargs)
+        if 'postgresql_tablespace' in dialect_kwargs:
+            serialized['tablespace'] = dialect_kwargs.pop('postgresql_tablespace')
+        if 'postgresql_partition_by' in dialect_kwargs:
+            serialized['partitionBy'] = dialect_kwargs.pop('postgresql_partition_by')
+        parameters = dict(dialect_kwargs.pop('postgresql_with', None) or {})
+        if 'fillfactor' in parameters:
+            serialized['fillfactor'] = parameters.pop('fillfactor')
+        if parameters:
+            dialect_kwargs['postgresql_with'] = parameters
+
+        dialect_options = {}
+        for key, value in dialect_kwargs.items():
+            dialect, option = key.split('_', 1)
+            dialect_options.setdefault(dialect, {})[option] = value
+        if dialect_options:
+            serialized['dialectOptions'] = dialect_options
+        return serialized
+
+
 class JSONTableSchema(ObjectSchema):
+    """
+    Table Descriptor
+
+    Load options:
+        - metadata: the `MetaData` of the loaded table, defaults to a new one.
+        - type_mapping: mapping of field type to SQLAlchemy type.
+        - intern: share names and types across loaded tables.
+        - only_fields: names of the fields to load, the primary key fields are always loaded.
+            other fields are neither validated nor built, indexes on them are skipped.
+
+    Dump options:
+        - type_mapping: mapping of field type to SQLAlchemy type.
+        - memoize: reuse the previous dump of an unchanged table (see `utilities.dump_cache`).
+            the memoized dump is shared, it must not be mutated.
+    """
+
     class Meta:
         object_class = Table
+        migrations = table_migrations
 
     name = ma_fields.String(required=True,
                             validate=Length(min=1),
                             metadata={'description': 'the table name'})
     schema = ma_fields.String(required=False,
+                              allow_none=True,
                               validate=Length(min=1))
     title = ma_fields.String()  # NOTE: useless for now
     fields = ma_fields.List(ma_fields.Nested(JSONFieldSchema))
@@ -147,24 +317,78 @@ class JSONTableSchema(ObjectSchema):
     primaryKey = ma_fields.List(
         ma_fields.String(validate=Length(min=1)),
         validate=Length(min=1))
+    indexes = ma_fields.List(ma_fields.Nested(JSONIndexSchema))
+    storage = ma_fields.Nested(JSONStorageSchema)
+
+    @pre_load
+    def project_fields(self, data: dict, **_) -> dict:
+        only_fields = self.get_option('only_fields')
+        if only_fields is None or not isinstance(data, dict) or not isinstance(data.get('fields'), list):
+            return data
+
+        fields = data['fields']
+        names = {field.get('name') for field in fields if isinstance(field, dict)}
+        unknown = [name for name in only_fields if name not in names]
+        if unknown:
+            raise ValidationError('Unknown fields: %s.' % ', '.join(map(str, unknown)), 'only_fields')
+
+        keep = set(only_fields).union(data.get('primaryKey') or [])
+        # don't mutate data
+        data = data.copy()
+        data['fields'] = [field for field in fields
+                          if not isinstance(field, dict) or field.get('name') in keep]
+        return data
 
     @post_load
     def create_object(self, data, **kwargs) -> Table:
-        metadata = self.context.get('metadata', MetaData())
-        if data.get('schema'):
-            metadata.schema = data['schema']
-
-        table = Table(data['name'], metadata)
+        metadata = self.get_option('metadata')
+        if metadata is None:
+            metadata = MetaData()
+
+        name = data['name']
+        if self.get_option('intern'):
+            name = intern_name(name)
+        storage = data.get('storage', {})
+        try:
+            table = Table(name, metadata,
+                          schema=data.get('schema'),
+                          prefixes=storage.get('prefixes'),
+                          **storage.get('dialect_kwargs', {}))
+        except ArgumentError as exc:
+            raise ValidationError(str(exc), 'storage') from exc
 
         for column in data['fields']:
             table.append_column(column)
 
         if 'primaryKey' in data:
-            pk_constraint = PrimaryKeyConstraintSchema().load({
+            pk_constraint = _pk_constraint_schema.load({
                 'columns': data['primaryKey']})
             table.append_constraint(pk_constraint)
+
+        projected = self.get_option('only_fields') is not None
+        for index_kwargs in data.get('indexes', []):
+            missing = [name for name in index_kwargs['columns'] if name not in table.c]
+            if missing and projected:
+                continue
+            if missing:
+                raise ValidationError('Unknown fields: %s.' % ', '.join(missing), 'indexes')
+            table.append_constraint(_index_schema.load(index_kwargs))
         return table
 
+    def dump(self, obj: Any, *, many: Optional[bool] = None, **options: Any) -> Any:
+        many = self.many if many is None else bool(many)
+        memoize = options.get('memoize', self.context.get('memoize', False))
+        if not memoize or many or not isinstance(obj, Table) or self.only is not None or self.exclude:
+            return super().dump(obj, many=many, **options)
+
+        type_mapping = options.get('type_mapping', self.context.get('type_mapping'))
+        key = (type(self), tuple(type_mapping.items()) if type_mapping else None)
+        serialized = dump_cache.get(obj, key)
+        if serialized is None:
+            serialized = super().dump(obj, many=False, **options)
+            dump_cache.set(obj, key, serialized)
+        return serialized
+
     @pre_dump
     def jsonable_encoder(self, table: Table, **_):
         serialized = {
@@ -172,6 +396,18 @@ class JSONTableSchema(ObjectSchema):
             'schema': table.schema,
             'fields': [_ for _ in table.columns],
         }
-        pk = PrimaryKeyConstraintSchema().dump(table.primary_key)
+        pk = _pk_constraint_schema.dump(table.primary_key)
         serialized['primaryKey'] = pk['columns']
+        indexes = []
+        for index in sorted(table.indexes, key=lambda index: index.name or ''):
+            if IndexSchema.is_functional(index):
+                # e.g. on lower(name), commonly found in reflected tables
+                warnings.warn('the functional index %r of table %r is not dumped, only indexes of '
+                              'columns can be described' % (index.name, table.name))
+                continue
+            indexes.append(index)
+        if indexes:
+            serialized['indexes'] = indexes
+        if table._prefixes or table.dialect_kwargs:
+            serialized['storage'] = table
         return serialized
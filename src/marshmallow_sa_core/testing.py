@@ -1,20 +1,156 @@
+"""Testing helpers
+
+- compare SQLAlchemy tables by their structure: columns, types, nullability, unique,
+  checks, primary key, foreign keys and indexes.
+
+The structure of a table is canonical (e.g. `Column(unique=True)` and a single column
+`UniqueConstraint` are the same), and is hashed to a fingerprint, so the expected structure
+of many tables can be stored and compared as strings. The structure is computed afresh on
+each call, so changes made in place (e.g. `column.nullable = False`) are never missed. The
+differences are only computed when the fingerprints differ.
+"""
+
+import functools
+import hashlib
+import types
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Tuple
+
 import sqlalchemy as sa
 from sqlalchemy import Column
 
+#: arguments not taken by the constructors (`*enums` of `Enum`).
+_EXTRA_TYPE_ARGUMENTS = {
+    sa.Enum: ('enums', 'name', 'schema', 'native_enum', 'create_constraint'),
+}
+
+#: constructor arguments which are not values of the type.
+_IGNORED_TYPE_ARGUMENTS = {'metadata', 'inherit_schema', 'quote', 'convert_unicode', 'unicode_error'}
+
+@functools.lru_cache(maxsize=None)
+def _type_arguments(cls: type) -> Tuple[str, ...]:
+    names = set(sa.util.get_cls_kwargs(cls))
+    for type_cls, extra in _EXTRA_TYPE_ARGUMENTS.items():
+        if issubclass(cls, type_cls):
+            names.update(extra)
+    return tuple(sorted(name for name in names if not name.startswith('_') and name not in _IGNORED_TYPE_ARGUMENTS))
+
+
+def _argument_repr(value: Any) -> str:
+    if isinstance(value, sa.types.TypeEngine):
+        return _type_key(value)[1]
+    if isinstance(value, (type, types.FunctionType, types.BuiltinFunctionType)):
+        return '%s.%s' % (value.__module__, value.__qualname__)
+    if isinstance(value, types.ModuleType):
+        return value.__name__
+    return repr(value)
+
+
+def _type_key(sa_type: Any) -> Tuple[str, str]:
+    """The class and the constructor arguments of a type, e.g. `String(length=10)`."""
+    cls = type(sa_type)
+    # the arguments are read from the attributes of the same name, much faster than `repr()`
+    arguments = ', '.join('%s=%s' % (name, _argument_repr(getattr(sa_type, name)))
+                          for name in _type_arguments(cls) if getattr(sa_type, name, None) is not None)
+    return '%s.%s' % (cls.__module__, cls.__qualname__), '%s(%s)' % (cls.__name__, arguments)
+
+
+def column_structure(column: Column) -> Tuple:
+    """(name, type, nullable) of a column."""
+    return column.name, _type_key(column.type), bool(column.nullable)
+
+
+def _check_constraints(table: sa.Table) -> List[sa.CheckConstraint]:
+    # column level checks may not be in the table constraints, each check is taken once
+    constraints = {id(c): c for c in table.constraints if isinstance(c, sa.CheckConstraint)}
+    for column in table.columns:
+        constraints.update((id(c), c) for c in column.constraints if isinstance(c, sa.CheckConstraint))
+    return list(constraints.values())
+
+
+def _sqltext(constraint: sa.CheckConstraint) -> str:
+    sqltext = constraint.sqltext
+    # compiling is slow, the text of textual checks (as loaded from descriptors) is used as is
+    return sqltext.text if isinstance(sqltext, sa.sql.elements.TextClause) else str(sqltext)
+
+
+def table_structure(table: sa.Table) -> Dict[str, Any]:
+    """Returns the canonical structure of a table, names of constraints and indexes excluded."""
+    unique = {(column.name,) for column in table.columns if column.unique}
+    unique.update(tuple(sorted(column.name for column in constraint.columns))
+                  for constraint in table.constraints if isinstance(constraint, sa.UniqueConstraint))
+    foreign_keys = {
+        (tuple(column.name for column in constraint.columns),
+         tuple(element.target_fullname for element in constraint.elements),
+         constraint.ondelete, constraint.onupdate)
+        for constraint in table.foreign_key_constraints
+    }
+    indexes = {(tuple(str(expr) if not isinstance(expr, Column) else expr.name for expr in index.expressions),
+                bool(index.unique))
+               for index in table.indexes}
+    return {
+        'name': table.name,
+        'schema': table.schema,
+        'columns': tuple(column_structure(column) for column in table.columns),
+        'primary_key': tuple(column.name for column in table.primary_key.columns),
+        'unique': tuple(sorted(unique)),
+        'checks': tuple(sorted(_sqltext(constraint) for constraint in _check_constraints(table))),
+        'foreign_keys': tuple(sorted(foreign_keys, key=repr)),
+        'indexes': tuple(sorted(indexes)),
+    }
+
+
+def _structure_fingerprint(structure: Dict[str, Any]) -> str:
+    return hashlib.sha256(repr(tuple(structure.items())).encode('utf-8')).hexdigest()
+
+
+def table_fingerprint(table: sa.Table) -> str:
+    """Returns the hash of the canonical structure of a table."""
+    return _structure_fingerprint(table_structure(table))
+
+
+def table_diff(left: sa.Table, right: sa.Table) -> List[str]:
+    """Returns the differences between the structures of two tables, one line each."""
+    return _structure_diff(table_structure(left), table_structure(right))
+
+
+def _structure_diff(left: Dict[str, Any], right: Dict[str, Any]) -> List[str]:
+    diff = []
+    for key in left:
+        if key == 'columns' or left[key] == right[key]:
+            continue
+        diff.append('%s: %r != %r' % (key, left[key], right[key]))
+
+    left_columns = {column[0]: column for column in left['columns']}
+    right_columns = {column[0]: column for column in right['columns']}
+    for name, column in left_columns.items():
+        if name not in right_columns:
+            diff.append('column %r: missing on the right' % name)
+        elif column != right_columns[name]:
+            for attribute, lvalue, rvalue in zip(('name', 'type', 'nullable'), column, right_columns[name]):
+                if lvalue != rvalue:
+                    diff.append('column %r %s: %r != %r' % (name, attribute, lvalue, rvalue))
+    for name in right_columns:
+        if name not in left_columns:
+            diff.append('column %r: missing on the left' % name)
+    if not diff and list(left_columns) != list(right_columns):
+        diff.append('column order: %r != %r' % (list(left_columns), list(right_columns)))
+    return diff
+
 
 def assert_sa_table_equal(left, right):
     assert left is not right
     assert isinstance(left, sa.Table)
     assert isinstance(right, sa.Table)
-    assert left.name == right.name
-    assert left.schema == right.schema
-    assert left.columns.keys() == right.columns.keys()
-    for key, column in left.columns.items():
-        rc = right.columns[key]
-        assert_sa_column_equal(column, rc)
+    left_structure, right_structure = table_structure(left), table_structure(right)
+    if _structure_fingerprint(left_structure) == _structure_fingerprint(right_structure):
+        return
+    diff = _structure_diff(left_structure, right_structure)
+    assert not diff, 'tables differ:\n' + '\n'.join(diff)
 
 
 def assert_sa_column_equal(left, right):
-    assert left.name == right.name
-    assert type(left.type) == type(right.type)
-    # TODO: Constraints compare
+    left_structure, right_structure = column_structure(left), column_structure(right)
+    assert left_structure == right_structure, '%r != %r' % (left_structure, right_structure)
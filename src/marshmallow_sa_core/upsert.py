@@ -0,0 +1,122 @@
+"""Bulk Upsert
+
+- upsert rows into a table by its primary key (the `primaryKey` of the table descriptor):
+  each batch is bulk inserted into a temporary staging table cloned from the table, then
+  merged with a single `INSERT ... SELECT ... ON CONFLICT DO UPDATE` statement.
+
+Supported dialects: PostgreSQL, SQLite (>= 3.24).
+"""
+
+import uuid
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+
+from sqlalchemy import Column
+from sqlalchemy import MetaData
+from sqlalchemy import Table
+from sqlalchemy import and_
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import true
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.engine import Connection
+
+DEFAULT_BATCH_SIZE = 10000
+
+_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+class UpsertResult(NamedTuple):
+    inserted: int
+    updated: int
+    #: existing rows left as they are, when the rows only hold the primary key.
+    unchanged: int = 0
+
+
+def staging_table(table: Table, name: str = None) -> Table:
+    """Returns a temporary table with the columns (name and type only) of `table`."""
+    name = name or '_staging_%s_%s' % (table.name, uuid.uuid4().hex[:8])
+    columns = [Column(column.name, column.type.copy()) for column in table.columns]
+    return Table(name, MetaData(), *columns, prefixes=['TEMPORARY'])
+
+
+def _batches(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bulk_upsert(connection: Connection,
+                table: Table,
+                rows: Iterable[Dict[str, Any]],
+                batch_size: int = DEFAULT_BATCH_SIZE) -> UpsertResult:
+    """
+    Upserts rows into a table by its primary key.
+
+    Rows are dicts of column values, all of them with the same keys, which must include the
+    primary key columns. Columns missing from the rows are left untouched on update. When a
+    batch has several rows with the same primary key, the last one wins.
+
+    The upsert runs in a savepoint of the caller's transaction: when it fails, the staging
+    table and the batches already merged are rolled back, and the transaction is still usable.
+
+    Returns:
+        - UpsertResult: the count of inserted, updated and unchanged rows.
+    """
+    dialect = connection.dialect.name
+    if dialect not in _INSERTS:
+        raise NotImplementedError('bulk upsert is not supported on %s' % dialect)
+    pk_names = [column.name for column in table.primary_key.columns]
+    if not pk_names:
+        raise ValueError('table %s has no primary key' % table.name)
+
+    staging = staging_table(table)
+    inserted = updated = unchanged = 0
+    with connection.begin_nested():
+        staging.create(connection)
+        for batch in _batches(rows, batch_size):
+            names = [column.name for column in table.columns if column.name in batch[0]]
+            missing = [name for name in pk_names if name not in names]
+            if missing:
+                raise ValueError('rows miss primary key columns: %s' % ', '.join(missing))
+
+            # the last row of a primary key wins
+            batch = list({tuple(row[name] for name in pk_names): row for row in batch}.values())
+
+            connection.execute(staging.delete())
+            connection.execute(staging.insert(), batch)
+
+            matched = connection.execute(
+                select(func.count()).select_from(staging.join(
+                    table, and_(*(table.c[name] == staging.c[name] for name in pk_names))))
+            ).scalar()
+
+            # the WHERE clause resolves the parsing ambiguity of SQLite upsert from SELECT
+            stmt = _INSERTS[dialect](table).from_select(
+                names, select(*(staging.c[name] for name in names)).where(true()))
+            update_names = [name for name in names if name not in pk_names]
+            if update_names:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=pk_names,
+                    set_={name: stmt.excluded[name] for name in update_names})
+                updated += matched
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=pk_names)
+                unchanged += matched
+            connection.execute(stmt)
+            inserted += len(batch) - matched
+        staging.drop(connection)
+    return UpsertResult(inserted, updated, unchanged)
@@ -1,3 +1,6 @@
+from typing import Mapping
+from typing import Optional
+
 from sqlalchemy import BigInteger
 from sqlalchemy import Boolean
 from sqlalchemy import Date
@@ -22,3 +25,15 @@ COLUMNTYPE_TO_SA_TYPE_MAPPING = {
   DBColumnType.json: JSONB,
   DBColumnType.bigint: BigInteger,
 }
+
+
+def column_type_of(sa_type, type_mapping: Mapping = COLUMNTYPE_TO_SA_TYPE_MAPPING) -> Optional[DBColumnType]:
+    """
+    Returns the `DBColumnType` of a SQLAlchemy type instance, None if it is not mapped.
+    The most specific mapped class wins, e.g. `BigInteger` over `Integer`.
+    """
+    for cls in type(sa_type).__mro__:
+        for type_as_str, sa_col_type in type_mapping.items():
+            if sa_col_type is cls:
+                return DBColumnType(type_as_str)
+    return None
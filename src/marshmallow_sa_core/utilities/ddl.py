@@ -0,0 +1,84 @@
+"""DDL extensions
+
+- `postgresql_with` table option: storage parameters of a PostgreSQL table, e.g.
+  `Table(..., postgresql_with={'fillfactor': 70})` renders `WITH (fillfactor = 70)`.
+  SQLAlchemy itself only supports it on indexes.
+
+Global side effects, on import of `marshmallow_sa_core`:
+    - the `postgresql_with` argument is registered on `Table`.
+    - a PostgreSQL compiler of `CreateTable` is registered (`sqlalchemy.ext.compiler`). It
+      delegates to the compiler registered before it, if any, and only changes the DDL of
+      tables with storage parameters. A `CreateTable` compiler registered later by the
+      application replaces it, and must delegate to it to keep rendering `WITH (...)`.
+"""
+
+import re
+from typing import Any
+from typing import Dict
+from typing import Mapping
+
+from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql.base import PGDialect
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateTable
+
+_PARAMETER_NAME = re.compile(r'^[A-Za-z_][A-Za-z0-9_.]*$')
+_PARAMETER_VALUE = re.compile(r'^[A-Za-z0-9_.+-]+$')
+
+
+def format_storage_parameters(parameters: Mapping[str, Any]) -> str:
+    """{'fillfactor': 70} -> 'fillfactor = 70', raises ValueError on unsafe names or values."""
+    formatted = []
+    for name, value in parameters.items():
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        if not _PARAMETER_NAME.match(str(name)) or not _PARAMETER_VALUE.match(str(value)):
+            raise ValueError('invalid storage parameter: %s = %s' % (name, value))
+        formatted.append('%s = %s' % (name, value))
+    return ', '.join(formatted)
+
+
+def _table_arguments(dialect_cls: type) -> Dict[str, Any]:
+    for cls, arguments in dialect_cls.construct_arguments:
+        if cls is Table:
+            return arguments
+    return {}
+
+
+def _previous_compiler(element_cls: type, dialect: str):
+    """The compiler of `element_cls` registered for `dialect` with `sqlalchemy.ext.compiler`, if any."""
+    dispatcher = element_cls.__dict__.get('_compiler_dispatcher')
+    return dispatcher.specs.get(dialect) if dispatcher is not None else None
+
+
+if 'with' not in _table_arguments(PGDialect):
+    Table.argument_for('postgresql', 'with', None)
+
+    _previous_create_table = _previous_compiler(CreateTable, 'postgresql')
+
+    @compiles(CreateTable, 'postgresql')
+    def _create_table_with_storage_parameters(element, compiler, **kw):
+        if _previous_create_table is not None:
+            ddl = _previous_create_table(element, compiler, **kw)
+        else:
+            ddl = compiler.visit_create_table(element, **kw)
+        parameters = element.element.dialect_options['postgresql']['with']
+        if not parameters:
+            # tables without storage parameters are left as compiled
+            return ddl
+
+        # WITH goes after PARTITION BY, before ON COMMIT and TABLESPACE
+        options = compiler.post_create_table(element.element)
+        if not ddl.endswith(options + '\n\n'):
+            raise CompileError('can not render the storage parameters of %s' % element.element)
+        head = ddl[:len(ddl) - len(options) - 2]
+        with_clause = '\n WITH (%s)' % format_storage_parameters(parameters)
+        for keyword in ('\n ON COMMIT ', '\n TABLESPACE '):
+            position = options.find(keyword)
+            if position != -1:
+                options = options[:position] + with_clause + options[position:]
+                break
+        else:
+            options += with_clause
+        return head + options + '\n\n'
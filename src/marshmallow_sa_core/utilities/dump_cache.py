@@ -0,0 +1,57 @@
+"""Memoized dumps of tables
+
+Entries are keyed by a weak reference to the `Table`, and dropped when a column, a constraint
+or an index is attached to it (SQLAlchemy `after_parent_attach` events). Attributes changed
+in place (e.g. `column.nullable = False`) are not tracked, `invalidate()` such a table.
+"""
+
+import threading
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import Column
+from sqlalchemy import Constraint
+from sqlalchemy import Index
+from sqlalchemy import Table
+from sqlalchemy import event
+
+
+class DumpCache:
+    def __init__(self) -> None:
+        self._entries: 'WeakKeyDictionary[Table, Dict[Hashable, Any]]' = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, table: Table, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            return self._entries.get(table, {}).get(key)
+
+    def set(self, table: Table, key: Hashable, serialized: Any) -> None:
+        with self._lock:
+            self._entries.setdefault(table, {})[key] = serialized
+
+    def invalidate(self, table: Table) -> None:
+        with self._lock:
+            self._entries.pop(table, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+dump_cache = DumpCache()
+
+
+def _invalidate_parent_table(target: Any, parent: Any) -> None:
+    table = parent if isinstance(parent, Table) else getattr(parent, 'table', None)
+    if isinstance(table, Table):
+        dump_cache.invalidate(table)
+
+
+for _cls in (Column, Constraint, Index):
+    event.listen(_cls, 'after_parent_attach', _invalidate_parent_table)
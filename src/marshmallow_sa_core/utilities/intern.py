@@ -0,0 +1,50 @@
+"""Interning of repeated names and types
+
+When the same descriptors are loaded into many `MetaData` (e.g. one per tenant), the
+loaded tables can share their immutable parts instead of holding a copy each:
+
+- names are shared `quoted_name` instances (SQLAlchemy would wrap an interned string
+  into a new one for each table and column), and SQL text is interned.
+- column types instantiated without arguments are shared `TypeEngine` instances,
+  except types bound to the schema (`SchemaEventTarget`, e.g. `Boolean`), which
+  SQLAlchemy copies per column as well.
+"""
+
+import sys
+from typing import Dict
+from typing import Type
+from typing import Union
+
+from sqlalchemy.sql.base import SchemaEventTarget
+from sqlalchemy.sql.elements import quoted_name
+from sqlalchemy.sql.type_api import TypeEngine
+
+_shared_types: Dict[Type[TypeEngine], TypeEngine] = {}
+_shared_names: Dict[str, quoted_name] = {}
+
+
+def intern_string(value: str) -> str:
+    return sys.intern(value)
+
+
+def intern_name(name: str) -> quoted_name:
+    """Returns the shared `quoted_name` of a table or column name."""
+    if isinstance(name, quoted_name) and name.quote is not None:
+        return name
+    try:
+        return _shared_names[name]
+    except KeyError:
+        return _shared_names.setdefault(name, quoted_name(intern_string(str(name)), None))
+
+
+def shared_type(type_: Union[Type[TypeEngine], TypeEngine]) -> Union[Type[TypeEngine], TypeEngine]:
+    """
+    Returns the shared instance of a type class, or `type_` as it is when it can not
+    be shared (an instance with its own arguments, or a schema bound type).
+    """
+    if not isinstance(type_, type) or issubclass(type_, SchemaEventTarget):
+        return type_
+    try:
+        return _shared_types[type_]
+    except KeyError:
+        return _shared_types.setdefault(type_, type_())
@@ -0,0 +1,87 @@
+"""Descriptor Migrations
+
+Migrate serialized data written by older versions of this library (indicated by
+its `__version__` key) to the format of the running version.
+"""
+
+import re
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import marshmallow_sa_core
+
+VERSION = marshmallow_sa_core.__version__
+
+#: a migration step takes the serialized data and returns the migrated data.
+#: the argument must not be mutated.
+Migration = Callable[[dict], dict]
+
+
+def parse_version(version: str) -> Tuple[int, ...]:
+    """'0.0.5' -> (0, 0, 5)"""
+    return tuple(int(part) for part in re.findall(r'\d+', str(version)))
+
+
+class MigrationRegistry:
+    """
+    Registry of migration steps between `__version__` values.
+
+    A step registered from version `A` to version `B` is applied to data whose version
+    is lower than `B` (versions between `A` and `B` still write the format of `A`), when
+    migrating to a version greater than or equal to `B`.
+    Steps are applied in version order. Composed chains are cached per (from, to) pair.
+    """
+
+    def __init__(self) -> None:
+        self._steps: List[Tuple[Tuple[int, ...], Tuple[int, ...], Migration]] = []
+        self._chains: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], Tuple[Migration, ...]] = {}
+
+    def register(self, from_version: str, to_version: str) -> Callable[[Migration], Migration]:
+        """Decorator registering a migration step from `from_version` to `to_version`."""
+        start, end = parse_version(from_version), parse_version(to_version)
+        if not start < end:
+            raise ValueError('can not migrate from %s to %s' % (from_version, to_version))
+
+        def decorator(func: Migration) -> Migration:
+            self._steps.append((start, end, func))
+            self._steps.sort(key=lambda step: (step[0], step[1]))
+            self._chains = {}
+            return func
+
+        return decorator
+
+    def chain(self, from_version: str, to_version: str = VERSION) -> Tuple[Migration, ...]:
+        """Returns the migration steps to apply, in order."""
+        key = (parse_version(from_version), parse_version(to_version))
+        try:
+            return self._chains[key]
+        except KeyError:
+            pass
+
+        start, end = key
+        steps = tuple(func for step_start, step_end, func in self._steps
+                      if start < step_end <= end)
+        self._chains[key] = steps
+        return steps
+
+    def migrate(self, data: Any, to_version: str = VERSION) -> Any:
+        """
+        Migrates the data to `to_version`.
+
+        Data without a __version__ field is regarded as up to date, and data which is not a
+        mapping is returned as it is (left to the validation).
+        """
+        if not isinstance(data, dict):
+            return data
+        version: Optional[str] = data.get('__version__')
+        if version is None or version == to_version:
+            return data
+
+        steps = self.chain(version, to_version)
+        for step in steps:
+            data = step(data)
+        return data
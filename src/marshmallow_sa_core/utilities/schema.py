@@ -1,5 +1,7 @@
 import types
-from typing import Any, List
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Iterator, List, Mapping, Optional
 from marshmallow import (
     EXCLUDE,
     Schema,
@@ -11,8 +13,38 @@ from marshmallow import (
 
 import marshmallow_sa_core
 
+if TYPE_CHECKING:
+    from marshmallow_sa_core.utilities.migration import MigrationRegistry
+
 VERSION = marshmallow_sa_core.__version__
 
+#: options of the running load or dump, e.g. `metadata` or `type_mapping`.
+#: they are per call (and per thread), so a schema instance can be shared across threads.
+_call_options: ContextVar[Mapping[str, Any]] = ContextVar("marshmallow_sa_core_options", default={})
+
+
+@contextmanager
+def call_options(schema: Schema, options: Mapping[str, Any]) -> Iterator[Mapping[str, Any]]:
+    """
+    Sets the options of a (nested) load or dump call. They take precedence over the options of the
+    enclosing call, which take precedence over the `context` the schema was constructed with.
+    """
+    outer = _call_options.get()
+    merged = {**schema.context, **outer, **options}
+    token = _call_options.set(merged)
+    try:
+        yield merged
+    finally:
+        _call_options.reset(token)
+
+
+def get_option(schema: Schema, name: str, default: Any = None) -> Any:
+    """Returns an option of the running call, falling back to the context of the schema."""
+    options = _call_options.get()
+    if name in options:
+        return options[name]
+    return schema.context.get(name, default)
+
 
 class ObjectSchemaOptions(SchemaOpts):
     def __init__(self, meta: Any, **kwargs: Any) -> None:
@@ -20,6 +52,7 @@ class ObjectSchemaOptions(SchemaOpts):
         self.object_class = getattr(meta, "object_class", None)
         self.exclude_fields = getattr(meta, "exclude_fields", None) or []
         self.unknown = getattr(meta, "unknown", EXCLUDE)
+        self.migrations = getattr(meta, "migrations", None)
 
 
 class ObjectSchema(Schema):
@@ -27,6 +60,12 @@ class ObjectSchema(Schema):
     This Marshmallow Schema automatically instantiates an object whose type is indicated by the
     `object_class` attribute of the class `Meta`. All deserialized fields are passed to the
     constructor's `__init__()` unless the name of the field appears in `Meta.exclude_fields`.
+
+    Data written by older versions of this library is migrated with the `MigrationRegistry`
+    given as `Meta.migrations`, if any.
+
+    Options such as `metadata` or `type_mapping` are passed per `load()` / `dump()` call (the
+    `context` is only read as defaults), so a schema instance is safe to share across threads.
     """
 
     OPTIONS_CLASS = ObjectSchemaOptions
@@ -35,11 +74,13 @@ class ObjectSchema(Schema):
         object_class = None  # type: type
         exclude_fields = []  # type: List[str]
         unknown = EXCLUDE
+        migrations: Optional["MigrationRegistry"] = None
 
     @pre_load
     def _remove_version(self, data: dict, **kwargs: Any) -> dict:
         """
-        Removes a __version__ field from the data, if present.
+        Removes a __version__ field from the data, if present (whatever the `unknown`
+        option of the call is, the data is only copied when it has the field).
 
         Args:
             - data (dict): the serialized data
@@ -47,9 +88,9 @@ class ObjectSchema(Schema):
         Returns:
             - dict: the data dict, without its __version__ field
         """
-        # don't mutate data
-        data = data.copy()
-        data.pop("__version__", None)
+        if isinstance(data, dict) and "__version__" in data:
+            # don't mutate data
+            data = {k: v for k, v in data.items() if k != "__version__"}
         return data
 
     @post_dump
@@ -63,27 +104,79 @@ class ObjectSchema(Schema):
         Returns:
             - dict: the data dict, with an additional __version__ field
         """
-        # don't mutate data
-        data = data.copy()
+        # data is freshly serialized, there is no need to copy it
         data.setdefault("__version__", VERSION)
         return data
 
-    def load(self, data: dict, create_object: bool = True, **kwargs: Any) -> Any:
+    def load(
+        self,
+        data: dict,
+        create_object: Optional[bool] = None,
+        *,
+        many: Optional[bool] = None,
+        partial: Any = None,
+        unknown: Optional[str] = None,
+        **options: Any
+    ) -> Any:
         """
-        Loads an object by first retrieving the appropate schema version (based on the data's
-        __version__ key).
+        Loads an object by first migrating the data to the running schema version (based on
+        the data's __version__ key).
 
         Args:
             - data (dict): the serialized data
             - create_object (bool): if True, an instantiated object will be returned. Otherwise,
-                the deserialized data dict will be returned.
-            - **kwargs (Any): additional keyword arguments for the load() method
+                the deserialized data dict will be returned. Defaults to the value of the
+                enclosing call, or True.
+            - many, partial, unknown: arguments of marshmallow's load() method
+            - **options (Any): options of this call, e.g. `metadata` or `type_mapping`
 
         Returns:
             - Any: the deserialized object or data
         """
-        self.context.setdefault("create_object", create_object)
-        return super().load(data, **kwargs)
+        if create_object is not None:
+            options["create_object"] = create_object
+        with call_options(self, options):
+            data = self.migrate(data, many=many)
+            return super().load(data, many=many, partial=partial, unknown=unknown)
+
+    def dump(self, obj: Any, *, many: Optional[bool] = None, **options: Any) -> Any:
+        """
+        Serializes an object.
+
+        Args:
+            - obj (Any): the object to serialize
+            - many (bool): whether the object is a collection
+            - **options (Any): options of this call, e.g. `type_mapping`
+
+        Returns:
+            - Any: the serialized data
+        """
+        with call_options(self, options):
+            return super().dump(obj, many=many)
+
+    def get_option(self, name: str, default: Any = None) -> Any:
+        """Returns an option of the running call."""
+        return get_option(self, name, default)
+
+    def migrate(self, data: Any, many: Optional[bool] = None) -> Any:
+        """
+        Migrates the serialized data with `Meta.migrations`. Each item is migrated on its own
+        when loading many, as they can be written by different versions.
+
+        Args:
+            - data (dict): the serialized data
+            - many (bool): whether the data is a collection, defaults to `self.many`
+
+        Returns:
+            - Any: the migrated data
+        """
+        migrations = self.opts.migrations
+        if migrations is None:
+            return data
+        many = self.many if many is None else bool(many)
+        if many and isinstance(data, list):
+            return [migrations.migrate(item) for item in data]
+        return migrations.migrate(data)
 
     @post_load
     def create_object(self, data: dict, **kwargs: Any) -> Any:
@@ -95,10 +188,10 @@ class ObjectSchema(Schema):
             - data (dict): the deserialized data
 
         Returns:
-            - Any: an instantiated object, if `create_object` is found in context; otherwise,
+            - Any: an instantiated object, if the `create_object` option is set; otherwise,
                 the data dict
         """
-        if self.context.get("create_object", True):
+        if self.get_option("create_object", True):
             object_class = self.opts.object_class
             if object_class is not None:
                 if isinstance(object_class, types.FunctionType):
@@ -0,0 +1,133 @@
+import os
+
+import sqlalchemy as sa
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import JSONTableSchema
+from marshmallow_sa_core import cache as cache_module
+from marshmallow_sa_core.cache import DescriptorCache
+from marshmallow_sa_core.testing import assert_sa_table_equal
+
+import pytest
+
+
+class CountingTableSchema(JSONTableSchema):
+    loads = 0
+
+    def load(self, *args, **kwargs):
+        type(self).loads += 1
+        return super().load(*args, **kwargs)
+
+
+class DescriptorCacheTest(fixtures.TestBase):
+    json_table = {
+        'name': 'items',
+        'fields': [
+            {'name': 'id', 'type': 'int', 'constraints': {'required': True}},
+            {'name': 'label', 'type': 'str', 'constraints': {'maxLength': 20}},
+        ],
+        'primaryKey': ['id'],
+        'indexes': [{'fields': ['label']}],
+    }
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        CountingTableSchema.loads = 0
+        return DescriptorCache(str(tmp_path), schema=CountingTableSchema())
+
+    def test_hit(self, cache):
+        first = cache.load(self.json_table, metadata=sa.MetaData())
+        metadata = sa.MetaData()
+        second = cache.load(self.json_table, metadata=metadata)
+        assert CountingTableSchema.loads == 1
+
+        assert second.metadata is metadata
+        assert metadata.tables['items'] is second
+        assert_sa_table_equal(first, second)
+        assert [c.name for c in second.primary_key] == ['id']
+        assert [index.name for index in second.indexes] == ['ix_items_label']
+
+    def test_without_metadata(self, cache):
+        cache.load(self.json_table)
+        table = cache.load(self.json_table)
+        assert CountingTableSchema.loads == 1
+        assert table.name == 'items'
+
+    def test_already_defined(self, cache):
+        metadata = sa.MetaData()
+        cache.load(self.json_table, metadata=metadata)
+        with pytest.raises(sa.exc.InvalidRequestError):
+            cache.load(self.json_table, metadata=metadata)
+
+    def test_invalidation(self, cache, monkeypatch):
+        cache.load(self.json_table)
+        cache.load(self.json_table, type_mapping={'int': sa.BigInteger, 'str': sa.Text})
+        cache.load(self.json_table, metadata=sa.MetaData(schema='other'))
+        assert CountingTableSchema.loads == 3
+
+        monkeypatch.setattr(cache_module, 'VERSION', '999.0.0')
+        cache.load(self.json_table)
+        assert CountingTableSchema.loads == 4
+
+    def test_schema_class(self, cache):
+        cache.load(self.json_table)
+
+        class OtherTableSchema(CountingTableSchema):
+            loads = 0
+
+        other = DescriptorCache(cache.directory, schema=OtherTableSchema())
+        other.load(self.json_table)
+        assert (CountingTableSchema.loads, OtherTableSchema.loads) == (1, 1)
+        assert cache.key(self.json_table) != other.key(self.json_table)
+
+    def test_adopt_by_copy(self, cache, monkeypatch):
+        cache.load(self.json_table, metadata=sa.MetaData())
+        # when the private MetaData API fails, the cached table is copied into the metadata
+        def move_table(table, metadata):
+            raise AttributeError('_add_table')
+
+        monkeypatch.setattr(cache_module, '_move_table', move_table)
+        metadata = sa.MetaData()
+        table = cache.load(self.json_table, metadata=metadata)
+        assert CountingTableSchema.loads == 1
+        assert table.metadata is metadata
+        assert metadata.tables['items'] is table
+        assert_sa_table_equal(cache.schema.load(self.json_table), table)
+
+    def test_type_mapping_is_kept(self, cache):
+        type_mapping = {'int': sa.BigInteger, 'str': sa.Text}
+        cache.load(self.json_table, type_mapping=type_mapping)
+        table = cache.load(self.json_table, type_mapping=type_mapping)
+        assert CountingTableSchema.loads == 1
+        assert type(table.c.label.type) is sa.Text
+
+    def test_type_instances(self, cache):
+        short = cache.load(self.json_table, type_mapping={'int': sa.Integer, 'str': sa.String(50)})
+        long = cache.load(self.json_table, type_mapping={'int': sa.Integer, 'str': sa.String(100)})
+        assert CountingTableSchema.loads == 2
+        assert (short.c.label.type.length, long.c.label.type.length) == (50, 100)
+
+    def test_intern(self, cache):
+        cache.load(self.json_table, metadata=sa.MetaData())
+        first = cache.load(self.json_table, metadata=sa.MetaData(), intern=True)
+        second = cache.load(self.json_table, metadata=sa.MetaData(), intern=True)
+        assert CountingTableSchema.loads == 1
+        assert first.c.label.name is second.c.label.name
+        assert first.c.id.type is second.c.id.type
+        first_check, = first.c.label.constraints
+        second_check, = second.c.label.constraints
+        assert first_check.sqltext.text is second_check.sqltext.text
+
+    def test_corrupted_entry(self, cache):
+        cache.load(self.json_table)
+        path = cache.path(cache.key(self.json_table))
+        with open(path, 'wb') as fp:
+            fp.write(b'garbage')
+        table = cache.load(self.json_table)
+        assert CountingTableSchema.loads == 2
+        assert table.name == 'items'
+
+    def test_clear(self, cache):
+        cache.load(self.json_table)
+        cache.clear()
+        assert os.listdir(cache.directory) == []
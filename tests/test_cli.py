@@ -0,0 +1,81 @@
+import io
+import json
+import os
+
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import cli
+
+import pytest
+
+VALID = {
+    'name': 'orders',
+    'fields': [{'name': 'id', 'type': 'int', 'constraints': {'required': True}}],
+    'primaryKey': ['id'],
+}
+INVALID = {
+    'name': 'orders',
+    'fields': [{'name': 'id', 'type': 'integer'}],
+}
+
+
+class ValidateTest(fixtures.TestBase):
+    @pytest.fixture
+    def tree(self, tmp_path):
+        (tmp_path / 'sub').mkdir()
+        (tmp_path / '.git').mkdir()
+        for i in range(3):
+            (tmp_path / ('%d.json' % i)).write_text(json.dumps(dict(VALID, name='t%d' % i)))
+        (tmp_path / 'sub' / 'bad.json').write_text(json.dumps(INVALID))
+        (tmp_path / 'sub' / 'broken.json').write_text('{"name": ')
+        (tmp_path / 'sub' / 'notes.txt').write_text('not a descriptor')
+        (tmp_path / '.git' / 'ignored.json').write_text('{}')
+        return tmp_path
+
+    def validate(self, tree, **kwargs):
+        out = io.StringIO()
+        kwargs.setdefault('cache', str(tree / '.cache.json'))
+        counts = cli.validate([str(tree)], out=out, **kwargs)
+        return counts, [json.loads(line) for line in out.getvalue().splitlines()]
+
+    def test_errors(self, tree):
+        counts, errors = self.validate(tree, cache=None)
+        assert counts == {'checked': 5, 'skipped': 0, 'invalid': 2}
+        assert errors[0] == {'path': str(tree / 'sub' / 'bad.json'),
+                             'errors': {'fields': {'0': {'type': ['Invalid enum value integer']}}}}
+        assert errors[1]['path'] == str(tree / 'sub' / 'broken.json')
+        assert errors[1]['errors']['_schema'][0].startswith('Invalid JSON')
+
+    def test_cache(self, tree):
+        assert self.validate(tree)[0] == {'checked': 5, 'skipped': 0, 'invalid': 2}
+        # valid files are skipped, invalid ones are checked again
+        assert self.validate(tree)[0] == {'checked': 2, 'skipped': 3, 'invalid': 2}
+
+        # same content, new mtime: skipped by its hash
+        stat = os.stat(tree / '0.json')
+        os.utime(tree / '0.json', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        (tree / 'copy.json').write_text((tree / '1.json').read_text())
+        assert self.validate(tree)[0] == {'checked': 2, 'skipped': 4, 'invalid': 2}
+
+        (tree / '2.json').write_text(json.dumps(INVALID))
+        (tree / 'sub' / 'bad.json').write_text(json.dumps(VALID))
+        assert self.validate(tree)[0] == {'checked': 3, 'skipped': 3, 'invalid': 2}
+
+    def test_cache_version(self, tree, monkeypatch):
+        self.validate(tree)
+        monkeypatch.setattr(cli, 'VERSION', '0.0.0')
+        assert self.validate(tree)[0]['checked'] == 5
+
+    def test_parallel(self, tree, monkeypatch):
+        monkeypatch.setattr(cli, 'MIN_PARALLEL_FILES', 0)
+        counts, errors = self.validate(tree, jobs=2, cache=None)
+        assert counts == {'checked': 5, 'skipped': 0, 'invalid': 2}
+        assert [error['path'] for error in errors] == [str(tree / 'sub' / 'bad.json'),
+                                                      str(tree / 'sub' / 'broken.json')]
+
+    def test_main(self, tree, capsys):
+        assert cli.main(['validate', '--no-cache', str(tree / '0.json')]) == 0
+        assert cli.main(['validate', '--no-cache', '--pattern', 'bad.*', str(tree)]) == 1
+        out, err = capsys.readouterr()
+        assert len(out.splitlines()) == 1
+        assert err.splitlines() == ['1 checked, 0 skipped, 0 invalid', '1 checked, 0 skipped, 1 invalid']
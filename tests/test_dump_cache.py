@@ -0,0 +1,56 @@
+import gc
+
+import sqlalchemy as sa
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import JSONTableSchema
+from marshmallow_sa_core.utilities.dump_cache import dump_cache
+
+
+class DumpCacheTest(fixtures.TestBase):
+    def setup_test(self):
+        dump_cache.clear()
+        self.table = sa.Table(
+            'people', sa.MetaData(),
+            sa.Column('id', sa.Integer, primary_key=True),
+            sa.Column('name', sa.String, nullable=False),
+        )
+
+    def test_memoize(self):
+        schema = JSONTableSchema()
+        first = schema.dump(self.table, memoize=True)
+        assert schema.dump(self.table, memoize=True) is first
+        assert JSONTableSchema().dump(self.table, memoize=True) is first
+        assert schema.dump(self.table) is not first
+        assert schema.dump(self.table) == first
+
+    def test_type_mapping_is_part_of_the_key(self):
+        schema = JSONTableSchema()
+        first = schema.dump(self.table, memoize=True)
+        other = schema.dump(self.table, memoize=True, type_mapping={'bigint': sa.Integer, 'str': sa.String})
+        assert other is not first
+        assert other['fields'][0]['type'] == 'bigint'
+
+    def test_invalidated_on_attach(self):
+        schema = JSONTableSchema()
+        first = schema.dump(self.table, memoize=True)
+
+        self.table.append_column(sa.Column('email', sa.String))
+        second = schema.dump(self.table, memoize=True)
+        assert second is not first
+        assert [f['name'] for f in second['fields']] == ['id', 'name', 'email']
+
+        sa.Index('ix_people_email', self.table.c.email)
+        third = schema.dump(self.table, memoize=True)
+        assert third is not second
+        assert third['indexes'] == [{'name': 'ix_people_email', 'fields': ['email']}]
+
+        self.table.append_constraint(sa.UniqueConstraint('email', name='uq_people_email'))
+        assert schema.dump(self.table, memoize=True) is not third
+
+    def test_weak_reference(self):
+        JSONTableSchema().dump(self.table, memoize=True)
+        assert len(dump_cache) == 1
+        del self.table
+        gc.collect()
+        assert len(dump_cache) == 0
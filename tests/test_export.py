@@ -0,0 +1,105 @@
+import csv
+import datetime
+import decimal
+import json
+import os
+
+import sqlalchemy as sa
+from sqlalchemy import testing
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import JSONTableSchema
+from marshmallow_sa_core.export import export_data_package
+
+import pytest
+
+
+class ExportTest(fixtures.TablesTest):
+    __backend__ = True
+
+    @classmethod
+    def define_tables(cls, metadata):
+        sa.Table(
+            'orders', metadata,
+            sa.Column('id', sa.Integer, primary_key=True),
+            sa.Column('item', sa.String, nullable=False),
+            sa.Column('paid', sa.Boolean),
+            sa.Column('ordered_at', sa.DateTime),
+            sa.Column('amount', sa.Float),
+        )
+        sa.Table(
+            'prices', metadata,
+            sa.Column('id', sa.Integer, primary_key=True),
+            sa.Column('label', sa.String),
+            sa.Column('price', sa.Numeric(10, 2)),
+            sa.Column('digest', sa.LargeBinary),
+        )
+
+    @classmethod
+    @testing.emits_warning('Dialect sqlite.* does \\*not\\* support Decimal')
+    def insert_data(cls, connection):
+        connection.execute(cls.tables.orders.insert(), [
+            {'id': i, 'item': 'item %d' % i, 'paid': i % 2 == 0,
+             'ordered_at': datetime.datetime(2022, 1, 1) + datetime.timedelta(hours=i),
+             'amount': i * 1.5 if i % 3 else None}
+            for i in range(1, 26)
+        ])
+        connection.execute(cls.tables.prices.insert(), [
+            {'id': 1, 'label': '', 'price': decimal.Decimal('9.99'), 'digest': b'\x00\xff'},
+            {'id': 2, 'label': None, 'price': None, 'digest': None},
+        ])
+
+    @pytest.mark.parametrize('format', ['csv', 'ndjson'])
+    def test_export(self, connection, tmp_path, format):
+        orders = self.tables.orders
+        descriptor = export_data_package(connection, orders, str(tmp_path), format=format, chunk_size=10)
+
+        resource, = descriptor['resources']
+        assert resource['path'] == 'orders.%s' % format
+        assert resource['stats'] == {'rows': 25}
+        with open(os.path.join(tmp_path, 'datapackage.json')) as fp:
+            assert json.load(fp) == descriptor
+        table = JSONTableSchema().load(resource['schema'])
+        assert table.c.keys() == orders.c.keys()
+
+        with open(os.path.join(tmp_path, resource['path']), newline='') as fp:
+            if format == 'csv':
+                rows = list(csv.DictReader(fp))
+            else:
+                rows = [json.loads(line) for line in fp]
+        assert len(rows) == 25
+        first, third = rows[0], rows[2]
+        if format == 'csv':
+            assert first == {'id': '1', 'item': 'item 1', 'paid': 'false',
+                             'ordered_at': '2022-01-01T01:00:00', 'amount': '1.5'}
+            assert third['amount'] == ''
+        else:
+            assert first == {'id': 1, 'item': 'item 1', 'paid': False,
+                             'ordered_at': '2022-01-01T01:00:00', 'amount': 1.5}
+            assert third['amount'] is None
+
+    @testing.emits_warning('Dialect sqlite.* does \\*not\\* support Decimal')
+    def test_unmapped_types(self, connection, tmp_path):
+        resource, = export_data_package(connection, self.tables.prices, str(tmp_path),
+                                        format='ndjson')['resources']
+        with open(os.path.join(tmp_path, resource['path'])) as fp:
+            rows = [json.loads(line) for line in fp]
+        assert rows == [{'id': 1, 'label': '', 'price': 9.99, 'digest': 'AP8='},
+                        {'id': 2, 'label': None, 'price': None, 'digest': None}]
+
+    @testing.emits_warning('Dialect sqlite.* does \\*not\\* support Decimal')
+    def test_csv_null_value(self, connection, tmp_path):
+        prices = self.tables.prices
+        resource, = export_data_package(connection, prices, str(tmp_path))['resources']
+        assert resource['schema']['missingValues'] == ['']
+
+        resource, = export_data_package(connection, prices, str(tmp_path), null_value='\\N')['resources']
+        assert resource['schema']['missingValues'] == ['\\N']
+        with open(os.path.join(tmp_path, resource['path']), newline='') as fp:
+            rows = list(csv.reader(fp))
+        # NULL and empty strings are told apart
+        assert [row[:3] for row in rows[1:]] == [['1', '', '9.99'], ['2', '\\N', '\\N']]
+
+    def test_unsupported_format(self, connection, tmp_path):
+        with pytest.raises(ValueError):
+            export_data_package(connection, self.tables.orders, str(tmp_path), format='xlsx')
@@ -0,0 +1,118 @@
+import marshmallow_sa_core
+from marshmallow import ValidationError
+from marshmallow_sa_core import JSONTableSchema
+from marshmallow_sa_core.ma_sa_core import IndexSchema
+
+import sqlalchemy as sa
+from sqlalchemy import testing
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.testing import AssertsExecutionResults
+from sqlalchemy.testing import fixtures
+from sqlalchemy.testing.assertsql import AllOf
+from sqlalchemy.testing.assertsql import CompiledSQL
+
+import pytest
+
+
+class IndexTest(fixtures.TestBase, AssertsExecutionResults):
+    __dialect__ = "default"
+
+    json_table = {
+        'name': 'users',
+        'fields': [
+            {'name': 'id', 'type': 'int', 'constraints': {'required': True}},
+            {'name': 'email', 'type': 'str'},
+            {'name': 'city', 'type': 'str'},
+            {'name': 'deleted', 'type': 'int'},
+        ],
+        'primaryKey': ['id'],
+        'indexes': [
+            {'name': 'ix_users_city', 'fields': ['city', 'id']},
+            {'name': 'uq_users_email', 'fields': ['email'], 'unique': True,
+             'where': 'deleted = 0', 'dialectOptions': {'postgresql': {'using': 'btree'}}},
+        ],
+    }
+
+    @testing.provide_metadata
+    def test_create(self):
+        metadata = self.metadata
+        table = JSONTableSchema().load(self.json_table, metadata=metadata)
+        assert {index.name for index in table.indexes} == {'ix_users_city', 'uq_users_email'}
+
+        self.assert_sql_execution(
+            testing.db,
+            lambda: metadata.create_all(testing.db, checkfirst=False),
+            AllOf(
+                CompiledSQL(
+                    "CREATE TABLE users ("
+                    "id INTEGER NOT NULL, "
+                    "email VARCHAR, "
+                    "city VARCHAR, "
+                    "deleted INTEGER, "
+                    "PRIMARY KEY (id)"
+                    ")"
+                ),
+                CompiledSQL("CREATE INDEX ix_users_city ON users (city, id)"),
+                CompiledSQL("CREATE UNIQUE INDEX uq_users_email ON users (email)"),
+            ),
+        )
+
+    def test_postgresql_ddl(self):
+        table = JSONTableSchema().load(self.json_table)
+        index, = [index for index in table.indexes if index.unique]
+        assert str(CreateIndex(index).compile(dialect=postgresql.dialect())) == (
+            "CREATE UNIQUE INDEX uq_users_email ON users USING btree (email) WHERE deleted = 0")
+
+    def test_sqlite_ddl(self):
+        table = JSONTableSchema().load(self.json_table)
+        index, = [index for index in table.indexes if index.unique]
+        assert str(CreateIndex(index).compile(dialect=sqlite.dialect())) == (
+            "CREATE UNIQUE INDEX uq_users_email ON users (email) WHERE deleted = 0")
+
+    def test_round_trip(self):
+        table = JSONTableSchema().load(self.json_table)
+        dumped = JSONTableSchema().dump(table)
+        assert dumped['indexes'] == self.json_table['indexes']
+        assert dumped['__version__'] == marshmallow_sa_core.__version__
+
+    def test_dump_unnamed(self):
+        table = sa.Table('t', sa.MetaData(), sa.Column('a', sa.Integer), sa.Index(None, 'a'))
+        assert JSONTableSchema().dump(table)['indexes'] == [{'fields': ['a'], 'name': 'ix_t_a'}]
+
+    def test_dump_expression_where(self):
+        table = sa.Table('t', sa.MetaData(), sa.Column('a', sa.Integer), sa.Column('deleted', sa.Boolean))
+        sa.Index('ix_t_a', table.c.a, postgresql_where=table.c.deleted == sa.false(),
+                 sqlite_where=table.c.a > 5)
+        dumped = JSONTableSchema().dump(table)['indexes']
+        assert dumped == [{'fields': ['a'], 'name': 'ix_t_a',
+                           'dialectOptions': {'postgresql': {'where': 'deleted = false'},
+                                              'sqlite': {'where': 'a > 5'}}}]
+
+    def test_dump_functional_index(self):
+        table = sa.Table('t', sa.MetaData(), sa.Column('a', sa.String), sa.Index('ix_t_a', 'a'))
+        index = sa.Index('ix_t_lower_a', sa.func.lower(table.c.a))
+        # the table is dumped without the index
+        with pytest.warns(UserWarning, match="functional index 'ix_t_lower_a'"):
+            dumped = JSONTableSchema().dump(table)
+        assert dumped['indexes'] == [{'fields': ['a'], 'name': 'ix_t_a'}]
+
+        with pytest.raises(ValueError, match='functional index'):
+            IndexSchema().dump(index)
+
+    def test_unknown_field(self):
+        json_table = dict(self.json_table, indexes=[{'fields': ['nope']}])
+        with pytest.raises(ValidationError) as exc_info:
+            JSONTableSchema().load(json_table)
+        assert 'indexes' in exc_info.value.messages
+
+    def test_unknown_dialect_option(self):
+        json_table = dict(self.json_table, indexes=[
+            {'fields': ['city'], 'dialectOptions': {'postgresql': {'nope': 1}}}])
+        with pytest.raises(ValidationError):
+            JSONTableSchema().load(json_table)
+
+    def test_projection_skips_indexes(self):
+        table = JSONTableSchema().load(self.json_table, only_fields=['city'])
+        assert [index.name for index in table.indexes] == ['ix_users_city']
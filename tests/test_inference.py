@@ -0,0 +1,108 @@
+import sqlalchemy as sa
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import JSONTableSchema
+from marshmallow_sa_core.inference import infer_column
+from marshmallow_sa_core.inference import infer_csv
+from marshmallow_sa_core.inference import infer_descriptor
+from marshmallow_sa_core.inference import reservoir_sample
+
+import pytest
+
+
+class InferColumnTest(fixtures.TestBase):
+    @pytest.mark.parametrize('values, type_', [
+        (['true', 'False'], 'bool'),
+        (['1', '-2', '+3'], 'int'),
+        (['1', str(2 ** 40)], 'bigint'),
+        (['1', '2.5', '1e3'], 'float'),
+        (['2022-01-11', '2021-12-31'], 'date'),
+        (['2022-01-11T08:00:00', '2022-01-11 09:30'], 'datetime'),
+        (['08:00:00', '23:59'], 'time'),
+        (['{"a": 1}', '[1, 2]'], 'json'),
+        (['1', 'foo'], 'str'),
+        (['nan', '1.5'], 'str'),
+        (['inf', '1'], 'str'),
+        (['', ''], 'str'),
+    ])
+    def test_type(self, values, type_):
+        assert infer_column('c', values)['type'] == type_
+
+    def test_constraints(self):
+        assert infer_column('c', ['3', '1', '2']) == {
+            'name': 'c', 'type': 'int',
+            'constraints': {'required': True, 'unique': True, 'minimum': 1, 'maximum': 3},
+        }
+        assert infer_column('c', ['ab', '', 'abcd', 'ab']) == {
+            'name': 'c', 'type': 'str',
+            'constraints': {'minLength': 2, 'maxLength': 4},
+        }
+        assert infer_column('c', ['true', 'false']) == {
+            'name': 'c', 'type': 'bool', 'constraints': {'required': True},
+        }
+
+
+class InferDescriptorTest(fixtures.TestBase):
+    def test_reservoir_sample_is_bounded(self):
+        sample, count = reservoir_sample(([i] for i in range(100000)), size=100, seed=1)
+        assert count == 100000
+        assert len(sample) == 100
+        assert reservoir_sample(([i] for i in range(100000)), size=100, seed=1)[0] == sample
+
+    def test_descriptor_is_loadable(self):
+        rows = [
+            ['id', 'name', 'score', ''],
+            ['1', 'foo', '1.5', 'x'],
+            ['2', 'bar', '', 'y'],
+            ['3', 'spam', '3'],
+        ]
+        descriptor = infer_descriptor(rows, 'scores')
+        assert [(f['name'], f['type']) for f in descriptor['fields']] == [
+            ('id', 'int'), ('name', 'str'), ('score', 'float'), ('field_4', 'str')]
+
+        table = JSONTableSchema().load(descriptor)
+        assert isinstance(table.c.id.type, sa.Integer)
+        assert not table.c.id.nullable
+        assert table.c.score.nullable
+
+    def test_constraints_cover_every_row(self):
+        rows = ([str(i), 'x' * (1 + i % 7), '' if i == 99999 else 'a'] for i in range(100000))
+        descriptor = infer_descriptor(rows, 'big', headers=['id', 'label', 'flag'], sample_size=10, seed=1)
+        id_, label, flag = descriptor['fields']
+        # unique is not inferred from a sample
+        assert id_['constraints'] == {'required': True, 'minimum': 0, 'maximum': 99999}
+        assert label['constraints']['minLength'] == 1
+        assert label['constraints']['maxLength'] == 7
+        assert flag['constraints'] == {'minLength': 1, 'maxLength': 1}
+
+        # the type is checked against every row, not the sampled ones only
+        rows = [[str(i)] for i in range(1000)] + [['x']]
+        assert infer_descriptor(rows, 't', headers=['c'], sample_size=10)['fields'][0]['type'] == 'str'
+
+    def test_unique(self):
+        # every value twice, a sample of the rows may still have distinct values only
+        rows = [[str(i // 2)] for i in range(20000)]
+        descriptor = infer_descriptor(rows, 't', headers=['c'], sample_size=100, seed=2)
+        assert 'unique' not in descriptor['fields'][0]['constraints']
+
+        rows = [[str(i)] for i in range(100)]
+        descriptor = infer_descriptor(rows, 't', headers=['c'], sample_size=100)
+        assert descriptor['fields'][0]['constraints']['unique'] is True
+        descriptor = infer_descriptor(rows, 't', headers=['c'], sample_size=99)
+        assert 'unique' not in descriptor['fields'][0]['constraints']
+
+    def test_chunks(self):
+        # the type and the bounds hold across chunks of values
+        rows = [[str(i), str(i)] for i in range(10000)] + [['1.5', 'x'], ['-1']]
+        id_, label = infer_descriptor(rows, 't', headers=['id', 'label'])['fields']
+        assert id_['type'] == 'float'
+        assert (id_['constraints']['minimum'], id_['constraints']['maximum']) == (-1, 9999)
+        assert label['type'] == 'str'
+        assert label['constraints'] == {'minLength': 1, 'maxLength': 4}
+
+    def test_csv(self, tmp_path):
+        path = tmp_path / 'events.csv'
+        path.write_text('id,happened_at\n1,2022-01-11T08:00:00\n2,2022-01-12T08:00:00\n')
+        descriptor = infer_csv(str(path))
+        assert descriptor['name'] == 'events'
+        assert descriptor['fields'][1]['type'] == 'datetime'
@@ -0,0 +1,50 @@
+import json
+
+import sqlalchemy as sa
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import JSONTableSchema
+
+
+class InternTest(fixtures.TestBase):
+    json_table = json.dumps({
+        'name': 'accounts',
+        'fields': [
+            {'name': 'id', 'type': 'int', 'constraints': {'required': True}},
+            {'name': 'name', 'type': 'str', 'constraints': {'maxLength': 20}},
+            {'name': 'active', 'type': 'bool'},
+        ],
+        'primaryKey': ['id'],
+    })
+
+    def load(self, intern):
+        tables = []
+        for tenant in ('a', 'b'):
+            metadata = sa.MetaData(schema=tenant)
+            schema = JSONTableSchema(context={'metadata': metadata, 'intern': intern})
+            tables.append(schema.load(json.loads(self.json_table)))
+        return tables
+
+    def test_share_names_and_types(self):
+        a, b = self.load(intern=True)
+        assert a.c.id.type is b.c.id.type
+        assert a.c.name.type is b.c.name.type
+        assert a.c.name.name is b.c.name.name
+        assert a.name is b.name
+
+        sqltexts = [next(iter(t.c.name.constraints)).sqltext.text for t in (a, b)]
+        assert sqltexts[0] is sqltexts[1]
+
+    def test_schema_bound_type_is_not_shared(self):
+        a, b = self.load(intern=True)
+        assert a.c.active.type is not b.c.active.type
+
+    def test_default_does_not_share(self):
+        a, b = self.load(intern=False)
+        assert a.c.id.type is not b.c.id.type
+
+    def test_same_ddl(self):
+        interned, _ = self.load(intern=True)
+        plain, _ = self.load(intern=False)
+        assert str(CreateTable(interned)) == str(CreateTable(plain))
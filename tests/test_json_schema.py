@@ -0,0 +1,74 @@
+import json
+
+from marshmallow import fields as ma_fields
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import JSONTableSchema
+from marshmallow_sa_core.json_schema import TABLE_DESCRIPTOR_JSON_SCHEMA_PATH
+from marshmallow_sa_core.json_schema import dumps
+from marshmallow_sa_core.json_schema import generate_json_schema
+from marshmallow_sa_core.json_schema import table_descriptor_json_schema
+from marshmallow_sa_core.utilities.enum import DBColumnType
+
+import pytest
+
+DESCRIPTOR = {
+    'name': 'readings',
+    'fields': [
+        {'name': 'id', 'type': 'int', 'constraints': {'required': True}},
+        {'name': 'sensor', 'type': 'str', 'constraints': {'maxLength': 32}},
+    ],
+    'primaryKey': ['id'],
+    'indexes': [{'fields': ['sensor'], 'where': 'sensor IS NOT NULL'}],
+    'storage': {'fillfactor': 70},
+}
+
+
+class JSONSchemaTest(fixtures.TestBase):
+    def test_shipped_schema_is_up_to_date(self):
+        with open(TABLE_DESCRIPTOR_JSON_SCHEMA_PATH, encoding='utf-8') as fp:
+            shipped = fp.read()
+        assert shipped == dumps(generate_json_schema(JSONTableSchema)), \
+            'regenerate it with `python -m marshmallow_sa_core.json_schema`'
+
+    def test_cached(self):
+        assert table_descriptor_json_schema() is table_descriptor_json_schema()
+        assert table_descriptor_json_schema() == generate_json_schema()
+
+    def test_definitions(self):
+        definitions = table_descriptor_json_schema()['definitions']
+        assert set(definitions) == {'JSONTable', 'JSONField', 'Constraints', 'JSONIndex', 'JSONStorage'}
+
+        field = definitions['JSONField']
+        assert field['required'] == ['name', 'type']
+        assert field['properties']['type']['enum'] == [member.value for member in DBColumnType]
+        assert field['properties']['constraints'] == {'$ref': '#/definitions/Constraints'}
+
+        assert definitions['Constraints']['additionalProperties'] is False
+        assert 'additionalProperties' not in definitions['JSONTable']  # unknown fields are excluded
+        assert definitions['JSONTable']['properties']['schema']['type'] == ['string', 'null']
+        assert definitions['JSONTable']['properties']['primaryKey']['minItems'] == 1
+        assert definitions['JSONStorage']['properties']['fillfactor'] == {
+            'type': 'integer', 'minimum': 10, 'maximum': 100,
+            'description': 'PostgreSQL fillfactor storage parameter'}
+
+    def test_subclass(self):
+        class AuditedTableSchema(JSONTableSchema):
+            owner = ma_fields.String(required=True)
+
+        json_schema = generate_json_schema(AuditedTableSchema)
+        assert json_schema['$ref'] == '#/definitions/AuditedTable'
+        table = json_schema['definitions']['AuditedTable']
+        assert table['required'] == ['name', 'owner']
+        assert 'JSONField' in json_schema['definitions']
+
+    def test_validate(self):
+        jsonschema = pytest.importorskip('jsonschema')
+        validator = jsonschema.Draft7Validator(table_descriptor_json_schema())
+
+        assert list(validator.iter_errors(DESCRIPTOR)) == []
+        assert list(validator.iter_errors(json.loads(json.dumps(
+            JSONTableSchema().dump(JSONTableSchema().load(DESCRIPTOR)))))) == []
+
+        invalid = dict(DESCRIPTOR, fields=[{'name': 'id', 'type': 'integer'}], storage={'fillfactor': 5})
+        assert len(list(validator.iter_errors(invalid))) == 2
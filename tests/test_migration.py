@@ -0,0 +1,84 @@
+from marshmallow import RAISE
+from sqlalchemy.testing import fixtures
+
+import marshmallow_sa_core
+from marshmallow_sa_core import JSONTableSchema
+from marshmallow_sa_core.utilities.migration import MigrationRegistry
+
+import pytest
+
+
+class MigrationRegistryTest(fixtures.TestBase):
+    def setup_test(self):
+        self.registry = MigrationRegistry()
+
+        @self.registry.register('0.0.1', '0.0.3')
+        def rename_columns(data):
+            data = dict(data)
+            data['fields'] = data.pop('columns')
+            return data
+
+        @self.registry.register('0.0.3', '0.0.4')
+        def rename_pk(data):
+            data = dict(data)
+            data['primaryKey'] = data.pop('pk')
+            return data
+
+    def test_chain(self):
+        chain = self.registry.chain('0.0.1', '0.0.5')
+        assert [step.__name__ for step in chain] == ['rename_columns', 'rename_pk']
+        assert self.registry.chain('0.0.3', '0.0.5') == chain[1:]
+        assert self.registry.chain('0.0.4', '0.0.5') == ()
+        # 0.0.2 still writes the format of 0.0.1
+        assert self.registry.chain('0.0.2', '0.0.5') == chain
+        assert self.registry.chain('0.0.2', '0.0.3') == chain[:1]
+        assert self.registry.chain('0.0.1', '0.0.5') is chain
+
+    def test_register_invalidates_chains(self):
+        chain = self.registry.chain('0.0.1', '0.0.5')
+
+        @self.registry.register('0.0.4', '0.0.5')
+        def noop(data):
+            return data
+
+        assert self.registry.chain('0.0.1', '0.0.5') == chain + (noop,)
+
+    def test_invalid_step(self):
+        with pytest.raises(ValueError):
+            self.registry.register('0.0.4', '0.0.4')
+
+    def test_load_mixed_versions(self):
+        registry = self.registry
+
+        class VersionedTableSchema(JSONTableSchema):
+            class Meta(JSONTableSchema.Meta):
+                migrations = registry
+
+        current = {
+            'name': 'current',
+            'fields': [{'name': 'id', 'type': 'int',
+                        '__version__': marshmallow_sa_core.__version__}],
+            'primaryKey': ['id'],
+            '__version__': marshmallow_sa_core.__version__,
+        }
+        old = {
+            'name': 'old',
+            'columns': [{'name': 'id', 'type': 'int', '__version__': '0.0.1'}],
+            'pk': ['id'],
+            '__version__': '0.0.1',
+        }
+        old_copy = {**old}
+        tables = VersionedTableSchema(many=True).load([current, old])
+        assert [t.name for t in tables] == ['current', 'old']
+        assert [c.name for c in tables[1].primary_key] == ['id']
+        assert old == old_copy
+
+    def test_version_with_unknown_raise(self):
+        descriptor = {
+            'name': 'current',
+            'fields': [{'name': 'id', 'type': 'int'}],
+            '__version__': marshmallow_sa_core.__version__,
+        }
+        table = JSONTableSchema().load(descriptor, unknown=RAISE)
+        assert table.name == 'current'
+        assert '__version__' in descriptor
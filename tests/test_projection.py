@@ -0,0 +1,39 @@
+from marshmallow import ValidationError
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import JSONTableSchema
+
+import pytest
+
+
+class ProjectionTest(fixtures.TestBase):
+    json_table = {
+        'name': 'wide',
+        'fields': (
+            [{'name': 'id', 'type': 'int', 'constraints': {'required': True}}]
+            + [{'name': 'c%d' % i, 'type': 'str', 'constraints': {'maxLength': 10}}
+               for i in range(100)]
+            + [{'name': 'broken', 'type': 'no-such-type'}]
+        ),
+        'primaryKey': ['id'],
+    }
+
+    def test_only_fields(self):
+        table = JSONTableSchema().load(self.json_table, only_fields=['c42', 'c7'])
+        assert table.c.keys() == ['id', 'c7', 'c42']
+        assert [c.name for c in table.primary_key] == ['id']
+
+    def test_unprojected_fields_are_not_validated(self):
+        with pytest.raises(ValidationError):
+            JSONTableSchema().load(self.json_table)
+        JSONTableSchema().load(self.json_table, only_fields=['c1'])
+
+    def test_unknown_field(self):
+        with pytest.raises(ValidationError) as exc_info:
+            JSONTableSchema().load(self.json_table, only_fields=['c1', 'nope'])
+        assert 'only_fields' in exc_info.value.messages
+
+    def test_data_is_not_mutated(self):
+        n_fields = len(self.json_table['fields'])
+        JSONTableSchema().load(self.json_table, only_fields=['c1'])
+        assert len(self.json_table['fields']) == n_fields
@@ -0,0 +1,84 @@
+import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import JSONTableSchema
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from marshmallow_sa_core.records import fetch_records  # noqa: E402
+from marshmallow_sa_core.records import iter_records  # noqa: E402
+from marshmallow_sa_core.records import nullable_fields  # noqa: E402
+from marshmallow_sa_core.records import to_dtype  # noqa: E402
+
+
+class RecordsTest(fixtures.TablesTest):
+    json_table = {
+        'name': 'readings',
+        'fields': [
+            {'name': 'id', 'type': 'bigint', 'constraints': {'required': True}},
+            {'name': 'sensor', 'type': 'str', 'constraints': {'required': True, 'maxLength': 8}},
+            {'name': 'value', 'type': 'float'},
+            {'name': 'ok', 'type': 'bool', 'constraints': {'required': True}},
+            {'name': 'day', 'type': 'date'},
+            {'name': 'at', 'type': 'time'},
+            {'name': 'note', 'type': 'str'},
+        ],
+        'primaryKey': ['id'],
+    }
+
+    @classmethod
+    def define_tables(cls, metadata):
+        JSONTableSchema().load(cls.json_table, metadata=metadata)
+
+    @classmethod
+    def insert_data(cls, connection):
+        connection.execute(cls.tables.readings.insert(), [
+            {'id': i, 'sensor': 's%d' % (i % 3), 'value': None if i % 4 == 0 else i / 2,
+             'ok': i % 2 == 0, 'day': datetime.date(2022, 1, i), 'at': datetime.time(i, 30),
+             'note': None if i % 5 else 'n%d' % i}
+            for i in range(1, 11)
+        ])
+
+    def test_dtype(self):
+        dtype = to_dtype(self.json_table)
+        assert dtype == np.dtype([
+            ('id', '<i8'), ('sensor', '<U8'), ('value', '<f8'), ('ok', '?'),
+            ('day', 'datetime64[D]'), ('at', 'timedelta64[us]'), ('note', 'O'),
+        ])
+        # maxLength is a CHECK constraint of the loaded table, not a String length
+        assert to_dtype(self.tables.readings) == np.dtype(
+            [(name, 'O' if name == 'sensor' else dtype[name]) for name in dtype.names])
+        assert nullable_fields(self.json_table) == ['value', 'day', 'at', 'note']
+
+    def test_fetch_records(self, connection):
+        dtype = to_dtype(self.tables.readings)
+        result = connection.execute(sa.select(self.tables.readings).order_by(self.tables.readings.c.id))
+        records = fetch_records(result, dtype, chunk_size=3)
+
+        assert len(records) == 10
+        assert records['id'].tolist() == list(range(1, 11))
+        assert records['sensor'][0] == 's1'
+        assert records['sensor'].mask.tolist() == [False] * 10
+        assert records['value'].mask.tolist() == [i % 4 == 0 for i in range(1, 11)]
+        assert records['value'][1] == 1.0
+        assert records['day'][0] == np.datetime64('2022-01-01')
+        assert records['at'][0] == np.timedelta64(90, 'm')
+        assert records['note'].mask.tolist() == [i % 5 != 0 for i in range(1, 11)]
+        assert records['note'][4] == 'n5'
+
+    def test_iter_records_reuses_buffer(self, connection):
+        dtype = to_dtype(self.tables.readings)
+        result = connection.execute(sa.select(self.tables.readings))
+        chunks = list(iter_records(result, dtype, chunk_size=4))
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+        assert np.shares_memory(chunks[0].data, chunks[1].data)
+
+    def test_missing_field(self, connection):
+        dtype = to_dtype(self.tables.readings)
+        result = connection.execute(sa.select(self.tables.readings.c.id))
+        with pytest.raises(ValueError):
+            fetch_records(result, dtype)
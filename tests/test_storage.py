@@ -0,0 +1,94 @@
+from marshmallow import ValidationError
+from marshmallow_sa_core import JSONTableSchema
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.testing import fixtures
+
+import pytest
+
+
+def ddl(table, dialect):
+    return str(CreateTable(table).compile(dialect=dialect.dialect())).strip()
+
+
+class StorageTest(fixtures.TestBase):
+    def json_table(self, **storage):
+        return {
+            'name': 'events',
+            'fields': [
+                {'name': 'id', 'type': 'int', 'constraints': {'required': True}},
+                {'name': 'created_at', 'type': 'date', 'constraints': {'required': True}},
+            ],
+            'primaryKey': ['id', 'created_at'],
+            'storage': storage,
+        }
+
+    def test_postgresql(self):
+        table = JSONTableSchema().load(self.json_table(
+            prefixes=['UNLOGGED'],
+            partitionBy='RANGE (created_at)',
+            fillfactor=70,
+            tablespace='fast_ssd',
+        ))
+        assert ddl(table, postgresql) == (
+            "CREATE UNLOGGED TABLE events (\n"
+            "\tid INTEGER NOT NULL, \n"
+            "\tcreated_at DATE NOT NULL, \n"
+            "\tPRIMARY KEY (id, created_at)\n"
+            ")\n"
+            " PARTITION BY RANGE (created_at)\n"
+            " WITH (fillfactor = 70)\n"
+            " TABLESPACE fast_ssd"
+        )
+
+    def test_postgresql_storage_parameters(self):
+        table = JSONTableSchema().load(self.json_table(
+            fillfactor=90,
+            dialectOptions={'postgresql': {'with': {'autovacuum_enabled': False}}},
+        ))
+        assert ddl(table, postgresql).endswith(
+            "\n WITH (autovacuum_enabled = false, fillfactor = 90)")
+
+    def test_other_tables_unchanged(self):
+        table = sa.Table('plain', sa.MetaData(), sa.Column('id', sa.Integer, primary_key=True),
+                         postgresql_tablespace='fast')
+        compiler = postgresql.dialect().ddl_compiler(postgresql.dialect(), None)
+        assert ddl(table, postgresql) == compiler.visit_create_table(CreateTable(table)).strip()
+
+    def test_sqlite(self):
+        table = JSONTableSchema().load(self.json_table(
+            prefixes=['TEMPORARY'],
+            dialectOptions={'sqlite': {'with_rowid': False}},
+        ))
+        assert ddl(table, sqlite) == (
+            "CREATE TEMPORARY TABLE events (\n"
+            "\tid INTEGER NOT NULL, \n"
+            "\tcreated_at DATE NOT NULL, \n"
+            "\tPRIMARY KEY (id, created_at)\n"
+            ")\n"
+            " WITHOUT ROWID"
+        )
+
+    def test_round_trip(self):
+        json_table = self.json_table(
+            prefixes=['UNLOGGED'],
+            partitionBy='RANGE (created_at)',
+            fillfactor=70,
+            tablespace='fast_ssd',
+            dialectOptions={'sqlite': {'with_rowid': False}},
+        )
+        table = JSONTableSchema().load(json_table)
+        assert JSONTableSchema().dump(table)['storage'] == json_table['storage']
+
+    @pytest.mark.parametrize('storage', [
+        {'prefixes': ['GLOBAL TEMPORARY; DROP TABLE users;']},
+        {'fillfactor': 5},
+        {'dialectOptions': {'postgresql': {'no_such_option': 1}}},
+        {'dialectOptions': {'postgresql': {'with': {'fillfactor': '70); DROP TABLE users; --'}}}},
+    ])
+    def test_invalid(self, storage):
+        with pytest.raises(ValidationError):
+            JSONTableSchema().load(self.json_table(**storage))
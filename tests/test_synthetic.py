@@ -0,0 +1,143 @@
+import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import JSONTableSchema
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from marshmallow_sa_core.synthetic import SyntheticData  # noqa: E402
+from marshmallow_sa_core.synthetic import batch_to_rows  # noqa: E402
+
+
+class SyntheticDataTest(fixtures.TablesTest):
+    run_deletes = 'each'
+
+    json_table = {
+        'name': 'accounts',
+        'fields': [
+            {'name': 'tenant', 'type': 'int', 'constraints': {'required': True}},
+            {'name': 'id', 'type': 'bigint', 'constraints': {'required': True}},
+            {'name': 'login', 'type': 'str',
+             'constraints': {'required': True, 'unique': True, 'minLength': 4, 'maxLength': 12}},
+            {'name': 'name', 'type': 'str', 'constraints': {'minLength': 2, 'maxLength': 8}},
+            {'name': 'score', 'type': 'float', 'constraints': {'minimum': 0, 'maximum': 1}},
+            {'name': 'level', 'type': 'int', 'constraints': {'minimum': -3, 'maximum': 3}},
+            {'name': 'active', 'type': 'bool', 'constraints': {'required': True}},
+            {'name': 'birthday', 'type': 'date'},
+            {'name': 'created_at', 'type': 'datetime'},
+            {'name': 'wakes_at', 'type': 'time'},
+        ],
+        'primaryKey': ['id', 'tenant'],
+    }
+
+    @classmethod
+    def define_tables(cls, metadata):
+        JSONTableSchema().load(cls.json_table, metadata=metadata)
+
+    def test_constraints(self, connection):
+        accounts = self.tables.accounts
+        data = SyntheticData(self.json_table, seed=7, null_fraction=0.2)
+        for rows in data.iter_rows(2500, batch_size=1000):
+            # CHECK, UNIQUE and PRIMARY KEY constraints are enforced by the database
+            connection.execute(accounts.insert(), rows)
+
+        assert connection.execute(sa.select(sa.func.count()).select_from(accounts)).scalar() == 2500
+        nulls = connection.execute(sa.select(sa.func.count()).where(accounts.c.name.is_(None))).scalar()
+        assert 300 < nulls < 700
+        row = connection.execute(sa.select(accounts).where(
+            accounts.c.birthday.isnot(None),
+            accounts.c.created_at.isnot(None),
+            accounts.c.wakes_at.isnot(None)).limit(1)).one()
+        assert isinstance(row.birthday, datetime.date)
+        assert isinstance(row.created_at, datetime.datetime)
+        assert isinstance(row.wakes_at, datetime.time)
+
+    def test_batch(self):
+        batch = SyntheticData(self.json_table, seed=7).batch(1000)
+        assert list(batch) == [field['name'] for field in self.json_table['fields']]
+        assert batch['id'].dtype == np.int64
+        assert batch['level'].dtype == np.int32
+        assert np.array_equal(batch['id'], np.arange(1000))
+        assert batch['login'].dtype == np.dtype('<U10')
+        assert len(set(batch['login'].tolist())) == 1000
+        assert batch['level'].min() == -3 and batch['level'].max() == 3
+        lengths = np.char.str_len(batch['name'].compressed())
+        assert lengths.min() == 2 and lengths.max() == 8
+        assert batch['name'].mask.any()
+        assert not np.ma.getmaskarray(batch['login']).any()
+
+    def test_reproducible(self):
+        def generate(seed):
+            data = SyntheticData(self.json_table, seed=seed)
+            return [row for rows in data.iter_rows(100, batch_size=30) for row in rows]
+
+        assert generate(1) == generate(1)
+        assert generate(1) != generate(2)
+
+    def test_json(self):
+        data = SyntheticData({'name': 't', 'fields': [{'name': 'payload', 'type': 'json'}]},
+                             seed=0, null_fraction=0)
+        rows = batch_to_rows(data.batch(3))
+        assert [set(row['payload']) for row in rows] == [{'n'}] * 3
+
+    def test_unique_range(self):
+        data = SyntheticData({'name': 't', 'fields': [
+            {'name': 'id', 'type': 'int'},
+            {'name': 'day', 'type': 'date', 'constraints': {'unique': True}},
+            {'name': 'at', 'type': 'datetime', 'constraints': {'unique': True}},
+        ], 'primaryKey': ['id']}, null_fraction=0)
+        ids = np.concatenate([batch['id'] for batch in data.iter_batches(1000001, batch_size=250000)])
+        # beyond the default range of int values, and of dates
+        assert np.array_equal(ids, np.arange(1000001))
+        assert ids.dtype == np.int32
+
+        day = data.batch(1)['day'][0]
+        assert day == np.datetime64('2000-01-01') + np.timedelta64(1000001, 'D')
+
+        data = SyntheticData({'name': 't', 'fields': [
+            {'name': 'id', 'type': 'int', 'constraints': {'unique': True, 'maximum': -1}}]}, null_fraction=0)
+        assert data.batch(3)['id'].tolist() == [-2 ** 31, -2 ** 31 + 1, -2 ** 31 + 2]
+
+    def test_unique_float(self):
+        def generate(minimum, maximum, size):
+            data = SyntheticData({'name': 't', 'fields': [
+                {'name': 'x', 'type': 'float',
+                 'constraints': {'unique': True, 'minimum': minimum, 'maximum': maximum}}]}, null_fraction=0)
+            return data, data.batch(size)['x']
+
+        data, values = generate(1, 1, 1)
+        assert values.tolist() == [1.0]
+        with pytest.raises(ValueError):
+            data.batch(1)
+
+        # the 5 floats of the range, each of them once
+        maximum = float(np.nextafter(np.nextafter(np.nextafter(np.nextafter(1.0, 2), 2), 2), 2))
+        data, values = generate(1, maximum, 5)
+        assert len(set(values.tolist())) == 5
+        assert values.min() == 1 and values.max() == maximum
+        with pytest.raises(ValueError):
+            data.batch(1)
+
+        _, values = generate(-1e-300, 1e-300, 5)
+        assert len(set(values.tolist())) == 5
+        assert values[0] == -1e-300
+
+        _, values = generate(0, 1, 1000)
+        assert len(set(values.tolist())) == 1000 and values.max() < 1
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            SyntheticData({'name': 't', 'fields': [{'name': 'x', 'type': 'timestamp'}]})
+        with pytest.raises(ValueError):
+            SyntheticData({'name': 't', 'fields': [
+                {'name': 'x', 'type': 'int', 'constraints': {'minimum': 3, 'maximum': 1}}]})
+
+        data = SyntheticData({'name': 't', 'fields': [
+            {'name': 'x', 'type': 'int', 'constraints': {'unique': True, 'minimum': 1, 'maximum': 10}}]})
+        data.batch(10)
+        with pytest.raises(ValueError):
+            data.batch(1)
@@ -0,0 +1,114 @@
+import sqlalchemy as sa
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import JSONTableSchema
+from marshmallow_sa_core.testing import assert_sa_column_equal
+from marshmallow_sa_core.testing import assert_sa_table_equal
+from marshmallow_sa_core.testing import table_diff
+from marshmallow_sa_core.testing import table_fingerprint
+
+import pytest
+
+
+def make_table(metadata=None, nullable=True, check='"qty" >= 0', unique_as_constraint=False, ondelete=None):
+    metadata = metadata or sa.MetaData()
+    sa.Table('customers', metadata, sa.Column('id', sa.Integer, primary_key=True))
+    args = [
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('customer_id', sa.Integer, sa.ForeignKey('customers.id', ondelete=ondelete)),
+        sa.Column('code', sa.String, unique=not unique_as_constraint),
+        sa.Column('qty', sa.Integer, sa.CheckConstraint(check), nullable=nullable),
+        sa.Index('ix_orders_customer_id', 'customer_id'),
+    ]
+    if unique_as_constraint:
+        args.append(sa.UniqueConstraint('code', name='uq_code'))
+    return sa.Table('orders', metadata, *args)
+
+
+class TableStructureTest(fixtures.TestBase):
+    def test_equal(self):
+        left, right = make_table(), make_table(unique_as_constraint=True)
+        assert table_fingerprint(left) == table_fingerprint(right)
+        assert table_diff(left, right) == []
+        assert_sa_table_equal(left, right)
+
+    def test_round_trip(self):
+        table = JSONTableSchema().load({
+            'name': 'items',
+            'fields': [
+                {'name': 'id', 'type': 'int', 'constraints': {'required': True}},
+                {'name': 'label', 'type': 'str', 'constraints': {'unique': True}},
+            ],
+            'primaryKey': ['id'],
+            'indexes': [{'fields': ['label']}],
+        })
+        schema = JSONTableSchema()
+        assert_sa_table_equal(table, schema.load(schema.dump(table)))
+
+    @pytest.mark.parametrize('kwargs, expected', [
+        ({'nullable': False}, ["column 'qty' nullable: True != False"]),
+        ({'check': '"qty" > 0'}, ["checks: ('\"qty\" >= 0',) != ('\"qty\" > 0',)"]),
+        ({'ondelete': 'CASCADE'}, ["foreign_keys: ((('customer_id',), ('customers.id',), None, None),) != "
+                                   "((('customer_id',), ('customers.id',), 'CASCADE', None),)"]),
+    ])
+    def test_diff(self, kwargs, expected):
+        left, right = make_table(), make_table(**kwargs)
+        assert table_fingerprint(left) != table_fingerprint(right)
+        assert table_diff(left, right) == expected
+        with pytest.raises(AssertionError, match='tables differ'):
+            assert_sa_table_equal(left, right)
+
+    def test_diff_columns(self):
+        left = sa.Table('t', sa.MetaData(), sa.Column('a', sa.Integer), sa.Column('b', sa.String))
+        right = sa.Table('t', sa.MetaData(), sa.Column('a', sa.BigInteger), sa.Column('c', sa.String))
+        assert table_diff(left, right) == [
+            "column 'a' type: ('sqlalchemy.sql.sqltypes.Integer', 'Integer()') != "
+            "('sqlalchemy.sql.sqltypes.BigInteger', 'BigInteger()')",
+            "column 'b': missing on the right",
+            "column 'c': missing on the left",
+        ]
+
+        reordered = sa.Table('t', sa.MetaData(), sa.Column('b', sa.String), sa.Column('a', sa.Integer))
+        assert table_diff(left, reordered) == ["column order: ['a', 'b'] != ['b', 'a']"]
+
+    def test_types(self):
+        def columns(*types):
+            return sa.Table('t', sa.MetaData(), *(sa.Column('c%d' % i, type_) for i, type_ in enumerate(types)))
+
+        types = [sa.Boolean, sa.Boolean(create_constraint=True), sa.Enum('a', 'b', name='status'), sa.PickleType]
+        left, right = columns(*types), columns(*types)
+        assert table_diff(left, right) == []
+        assert table_fingerprint(left) == table_fingerprint(right)
+        assert_sa_table_equal(left, right)
+
+        schema = JSONTableSchema()
+        descriptor = {'name': 'flags', 'fields': [{'name': 'on', 'type': 'bool'}]}
+        assert_sa_table_equal(schema.load(descriptor), schema.load(descriptor))
+
+        assert table_diff(columns(sa.Enum('a', 'b', name='status')), columns(sa.Enum('a', 'c', name='status'))) == [
+            "column 'c0' type: ('sqlalchemy.sql.sqltypes.Enum', \"Enum(create_constraint=False, "
+            "enums=['a', 'b'], length=1, name='status', native_enum=True)\") != "
+            "('sqlalchemy.sql.sqltypes.Enum', \"Enum(create_constraint=False, "
+            "enums=['a', 'c'], length=1, name='status', native_enum=True)\")",
+        ]
+
+    def test_changed_in_place(self):
+        left, right = make_table(), make_table()
+        assert_sa_table_equal(left, right)
+        fingerprint = table_fingerprint(right)
+
+        right.c.qty.nullable = False
+        right.c.code.type = sa.String(5)
+        assert table_fingerprint(right) != fingerprint
+        assert table_diff(left, right) == [
+            "column 'code' type: ('sqlalchemy.sql.sqltypes.String', 'String()') != "
+            "('sqlalchemy.sql.sqltypes.String', 'String(length=5)')",
+            "column 'qty' nullable: True != False",
+        ]
+        with pytest.raises(AssertionError, match='tables differ'):
+            assert_sa_table_equal(left, right)
+
+    def test_column(self):
+        assert_sa_column_equal(sa.Column('a', sa.String(10)), sa.Column('a', sa.String(10)))
+        with pytest.raises(AssertionError):
+            assert_sa_column_equal(sa.Column('a', sa.String(10)), sa.Column('a', sa.String(20)))
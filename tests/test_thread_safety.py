@@ -0,0 +1,85 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import sqlalchemy as sa
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import JSONTableSchema
+from marshmallow_sa_core.utilities.enum import DBColumnType
+
+
+class PerCallOptionsTest(fixtures.TestBase):
+    json_table = {
+        'name': 'notes',
+        'schema': 'scma',
+        'fields': [
+            {'name': 'id', 'type': 'int', 'constraints': {'required': True}},
+            {'name': 'body', 'type': 'str'},
+        ],
+        'primaryKey': ['id'],
+    }
+
+    def test_options_do_not_leak(self):
+        schema = JSONTableSchema()
+        metadata = sa.MetaData()
+        type_mapping = {'int': sa.BigInteger, 'str': sa.Text}
+
+        table = schema.load(self.json_table, metadata=metadata, type_mapping=type_mapping)
+        assert table.metadata is metadata
+        assert metadata.schema is None
+        assert isinstance(table.c.body.type, sa.Text)
+        assert schema.context == {}
+
+        table = schema.load(self.json_table)
+        assert table.metadata is not metadata
+        assert type(table.c.body.type) is sa.String
+
+    def test_dump_type_mapping(self):
+        table = sa.Table('t', sa.MetaData(), sa.Column('body', sa.Text))
+        dumped = JSONTableSchema().dump(table, type_mapping={DBColumnType.json: sa.Text})
+        assert dumped['fields'][0]['type'] == 'json'
+
+
+class ThreadSafetyTest(fixtures.TestBase):
+    type_mappings = [
+        {'int': sa.Integer, 'str': sa.String},
+        {'int': sa.BigInteger, 'str': sa.Text},
+        {'int': sa.SmallInteger, 'str': sa.Unicode},
+    ]
+
+    def test_concurrent_loads(self):
+        schema = JSONTableSchema()
+        n_threads, n_loads = 8, 50
+        barrier = threading.Barrier(n_threads)
+
+        def work(worker):
+            barrier.wait()
+            type_mapping = self.type_mappings[worker % len(self.type_mappings)]
+            for i in range(n_loads):
+                metadata = sa.MetaData()
+                name = 'w%d_t%d' % (worker, i)
+                table = schema.load({
+                    'name': name,
+                    'schema': 'tenant_%d' % worker,
+                    'fields': [
+                        {'name': 'id', 'type': 'int', 'constraints': {'required': True}},
+                        {'name': 'col_%d' % worker, 'type': 'str', 'constraints': {'maxLength': worker + 1}},
+                    ],
+                    'primaryKey': ['id'],
+                }, metadata=metadata, type_mapping=type_mapping)
+
+                assert table.metadata is metadata
+                assert list(metadata.tables) == ['tenant_%d.%s' % (worker, name)]
+                assert table.c.keys() == ['id', 'col_%d' % worker]
+                assert type(table.c.id.type) is type_mapping['int']
+                assert type(table.c['col_%d' % worker].type) is type_mapping['str']
+                check, = table.c['col_%d' % worker].constraints
+                assert check.sqltext.text == 'LENGTH("col_%d") <= %d' % (worker, worker + 1)
+
+                dumped = schema.dump(table, type_mapping=type_mapping)
+                assert dumped['name'] == name
+                assert dumped['schema'] == 'tenant_%d' % worker
+            return worker
+
+        with ThreadPoolExecutor(n_threads) as executor:
+            assert sorted(executor.map(work, range(n_threads))) == list(range(n_threads))
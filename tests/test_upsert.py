@@ -0,0 +1,82 @@
+import sqlalchemy as sa
+from sqlalchemy.testing import fixtures
+
+from marshmallow_sa_core import JSONTableSchema
+from marshmallow_sa_core.upsert import UpsertResult
+from marshmallow_sa_core.upsert import bulk_upsert
+
+import pytest
+
+
+class BulkUpsertTest(fixtures.TablesTest):
+    __backend__ = True
+    run_deletes = 'each'
+
+    @classmethod
+    def define_tables(cls, metadata):
+        JSONTableSchema().load({
+            'name': 'prices',
+            'fields': [
+                {'name': 'shop', 'type': 'str', 'constraints': {'required': True}},
+                {'name': 'sku', 'type': 'int', 'constraints': {'required': True}},
+                {'name': 'price', 'type': 'float', 'constraints': {'minimum': 0}},
+                {'name': 'note', 'type': 'str'},
+            ],
+            'primaryKey': ['shop', 'sku'],
+        }, metadata=metadata)
+        sa.Table('no_pk', metadata, sa.Column('x', sa.Integer))
+
+    def rows(self, connection):
+        prices = self.tables.prices
+        return {(r.shop, r.sku): (r.price, r.note)
+                for r in connection.execute(sa.select(prices))}
+
+    def test_upsert(self, connection):
+        prices = self.tables.prices
+        connection.execute(prices.insert(), [
+            {'shop': 'a', 'sku': 1, 'price': 1.0, 'note': 'keep'},
+            {'shop': 'a', 'sku': 2, 'price': 2.0, 'note': 'keep'},
+        ])
+
+        result = bulk_upsert(connection, prices, [
+            {'shop': 'a', 'sku': 2, 'price': 2.5},
+            {'shop': 'a', 'sku': 3, 'price': 3.0},
+            {'shop': 'b', 'sku': 1, 'price': 4.0},
+            {'shop': 'b', 'sku': 1, 'price': 4.5},
+        ], batch_size=2)
+
+        assert result == UpsertResult(inserted=2, updated=1)
+        assert self.rows(connection) == {
+            ('a', 1): (1.0, 'keep'),
+            ('a', 2): (2.5, 'keep'),
+            ('a', 3): (3.0, None),
+            ('b', 1): (4.5, None),
+        }
+        assert sa.inspect(connection).get_temp_table_names() == []
+
+    def test_primary_key_only(self, connection):
+        prices = self.tables.prices
+        connection.execute(prices.insert(), [{'shop': 'a', 'sku': 1, 'price': 1.0}])
+        result = bulk_upsert(connection, prices, [{'shop': 'a', 'sku': 1}, {'shop': 'a', 'sku': 2}])
+        assert result == UpsertResult(inserted=1, updated=0, unchanged=1)
+        assert self.rows(connection) == {('a', 1): (1.0, None), ('a', 2): (None, None)}
+
+    def test_failure_rolls_back_to_savepoint(self, connection):
+        prices = self.tables.prices
+        connection.execute(prices.insert(), [{'shop': 'a', 'sku': 1, 'price': 1.0}])
+        with pytest.raises(sa.exc.IntegrityError):
+            # the second batch breaks the CHECK constraint of price
+            bulk_upsert(connection, prices, [
+                {'shop': 'a', 'sku': 1, 'price': 2.0},
+                {'shop': 'a', 'sku': 2, 'price': -1.0},
+            ], batch_size=1)
+
+        # the transaction is still usable, and the first batch is rolled back
+        assert self.rows(connection) == {('a', 1): (1.0, None)}
+        assert sa.inspect(connection).get_temp_table_names() == []
+
+    def test_invalid(self, connection):
+        with pytest.raises(ValueError):
+            bulk_upsert(connection, self.tables.no_pk, [{'x': 1}])
+        with pytest.raises(ValueError):
+            bulk_upsert(connection, self.tables.prices, [{'shop': 'a', 'price': 1.0}])